@@ -15,30 +15,55 @@ Ordre d'évaluation (règles validées) :
 
 Caractéristiques :
 - NDC multi-clients : CAPS et AVEM (tolérance aux espaces internes entre lettres).
-- Extraction "1re page" robuste (paragraphes, tables, textboxes, header/footer) avec namespaces + safe_xpath.
+- Regex NDC exécutée par RE2 si le module optionnel `google-re2` est installé (sinon `re`).
+- Extraction "1re page" robuste (paragraphes, tables, textboxes, header/footer) avec namespaces + safe_xpath,
+  en lisant directement le ZIP (word/document.xml en streaming, arrêt au 1er saut de page).
 - Si le DOCX est illisible, on CLASSIFIE quand même par le NOM (et on copie).
-- Rapport Excel écrit dans le parent de --docx-dir (ex: datas/classify_report.xlsx).
+- Rapport écrit dans le parent de --docx-dir : CSV par défaut (ex: datas/classify_report.csv),
+  Excel avec --report-format xlsx (datas/classify_report.xlsx), Parquet avec --report-format parquet
+  (module optionnel `pyarrow`).
+- Parallélisation configurable via --workers (lecture + classification + copie par worker).
 
 ⚠️ Modif demandée ici :
 - La partie "année" du motif NDC n’est plus limitée aux chiffres : elle accepte désormais 4 caractères alphanumériques (ex: `A2B3`).
 """
 
 import argparse
+import csv
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+from contextlib import closing, nullcontext
 from datetime import datetime
+from functools import lru_cache
+import io
+import logging
+import logging.handlers
+import multiprocessing
+import os
 from pathlib import Path
+import posixpath
 import re
 import shutil
+import sys
+import tempfile
+from typing import Iterator, Tuple
 import unicodedata
+import zipfile
 
-import pandas as pd
-from docx import Document
-from docx.oxml.ns import qn
+from lxml import etree
 
 # ---------- Configuration par défaut ----------
 DEFAULT_INPUT_DIR = "docx"
 DEFAULT_OUTPUT_DIR = "classified_docx"
 DEFAULT_ON_EXISTS = "skip"      # skip | overwrite | suffix
 DEFAULT_FIRST_PAGE_CHAR_LIMIT = 12000
+DEFAULT_WORKERS = 0             # 0 = auto (nombre de CPU)
+DEFAULT_COPY_MODE = "copy"      # copy | copyfile | hardlink | reflink | symlink
+DEFAULT_REPORT_FORMAT = "csv"   # csv | xlsx | parquet
+DEFAULT_COPY_THREADS = 0        # 0 = copies faites dans les workers ; N > 0 = N threads de copie côté parent
+DEFAULT_LOG_FLUSH_EVERY = 50    # lignes de progression bufferisées avant écriture (1 = immédiat)
+
+logger = logging.getLogger(__name__)
 
 # ---------- Namespaces XML pour les XPath ----------
 NS = {
@@ -49,225 +74,621 @@ NS = {
 }
 
 def safe_xpath(el, expression):
-    """Exécute un XPath en sécurité et renvoie [] en cas d'échec (évite XPathEvalError)."""
+    """
+    Exécute un XPath en sécurité et renvoie [] en cas d'échec (évite XPathEvalError).
+    `expression` : XPath précompilé (etree.XPath) ou chaîne.
+    """
     try:
+        if isinstance(expression, etree.XPath):
+            return expression(el)
         return el.xpath(expression, namespaces=NS)
     except Exception:
         return []
 
+# XPath compilés une fois pour toutes (évite la recompilation à chaque élément)
+XPATH_T = etree.XPath(".//w:t", namespaces=NS)
+XPATH_P = etree.XPath(".//w:p", namespaces=NS)
+
 # ---------- EDB Tokens (insensibles accents/casse) ----------
 EDB_TOKENS = [
     "expression de besoin",
     "expression de besoins",
     "expressions de besoins",
 ]
+# Une seule passe regex (alternation) au lieu d'un test "in" par token.
+# Garder l'alternation littérale dans l'ordre de EDB_TOKENS : l'ordre fixe la phrase citée dans la raison,
+# et un motif factorisé du type "expressions? de besoins?" accepterait aussi "expressions de besoin".
+EDB_TOKENS_REGEX = re.compile("|".join(re.escape(t) for t in EDB_TOKENS))
 
 # RÈGLE A (nom) : expr + (de)? + besoin(s), séparateurs libres (. _ - espaces), accents/casse insensibles
 EDB_NAME_ABBR_PATTERN = r"\bexpr(?:ession)?[\W_]*(?:de[\W_]*)?besoin(?:s)?\b"
 EDB_NAME_ABBR_REGEX = re.compile(EDB_NAME_ABBR_PATTERN)
 
+# Règle 3 (nom) en une seule passe : phrases EDB OU abréviation (groupes nommés pour la raison)
+EDB_NAME_REGEX = re.compile(rf"(?P<phrase>{EDB_TOKENS_REGEX.pattern})|(?P<abbrev>{EDB_NAME_ABBR_PATTERN})")
+
 # ---------- Regex NDC (large et tolérante) ----------
-# Clients acceptés avec tolérance espaces internes : "CAPS" -> C\s*A\s*P\s*S ; "AVEM" -> A\s*V\s*E\s*M
+# Moteur : RE2 (automate, temps linéaire) si installé (`pip install google-re2`), sinon `re`.
+# Le motif est écrit pour avoir le même sens dans les deux moteurs (pas de \uXXXX, pas de \s).
+try:
+    import re2
+    RE2_AVAILABLE = True
+except Exception:
+    RE2_AVAILABLE = False
+
+# Espaces au sens de Python (str.isspace) : le \s de RE2 est ASCII seulement
+WS = "[" + "".join(chr(c) for c in range(0x3001) if chr(c).isspace()) + "]"
+
+# Clients acceptés avec tolérance espaces internes : "CAPS" -> C WS* A WS* P WS* S ; "AVEM" -> A WS* V WS* E WS* M
 CLIENTS = ["CAPS", "AVEM"]
-CLIENT_PATTERNS = [r"\s*".join(list(c)) for c in CLIENTS]   # ["C\s*A\s*P\s*S", "A\s*V\s*E\s*M"]
+CLIENT_PATTERNS = [(WS + "*").join(list(c)) for c in CLIENTS]
 CLIENT_ALT = "(?:" + "|".join(CLIENT_PATTERNS) + ")"
 
-# Séparateurs libres entre segments : espace, underscore, hyphens (ASCII et typographiques)
-SEP = r"[ \-_\u2011\u2012\u2013\u2014]*"   # 0+ pour tolérer client+année collés (CAPS2023-123)
+# Séparateurs libres entre segments : espace, underscore, hyphens (ASCII et typographiques U+2011..U+2014)
+SEP = "[ \\-_\u2011\u2012\u2013\u2014]*"   # 0+ pour tolérer client+année collés (CAPS2023-123)
 
 # Modèle NDC : CLIENT SEP YEAR(4 alphanum) SEP CODE
 # - YEAR : 4 caractères alphanumériques (⚠️ élargi vs version précédente)
 # - CODE : alphanum + sous-segments '-'/'_' (déjà élargi précédemment)
 # Pas d'ancre de fin (pour capter des suffixes "_PF", etc.)
 NDC_PATTERN = rf"(?i){CLIENT_ALT}{SEP}[A-Za-z0-9]{{4}}{SEP}[A-Za-z0-9][A-Za-z0-9\-_]*"
-NDC_REGEX = re.compile(NDC_PATTERN, flags=re.IGNORECASE)
+
+def compile_ndc_regex(pattern: str):
+    """
+    Compile avec RE2 si disponible, sinon (ou si RE2 refuse le motif) avec `re`.
+    Retourne (regex compilée, nom du moteur) ; le moteur est affiché au lancement.
+    """
+    if RE2_AVAILABLE:
+        try:
+            return re2.compile(pattern), "re2"
+        except Exception:
+            pass
+    return re.compile(pattern, flags=re.IGNORECASE), "re"
+
+NDC_REGEX, NDC_REGEX_ENGINE = compile_ndc_regex(NDC_PATTERN)
+
+def may_contain_ndc(text: str) -> bool:
+    """
+    Préfiltre sans regex : tout code NDC contient 'caps' ou 'avem' une fois les espaces retirés
+    (la regex tolère des espaces entre les lettres du client). Faux positifs possibles, jamais
+    de faux négatifs ; 'ſ' (s long) est ramené à 's' car la regex le reconnaît en IGNORECASE.
+    """
+    t = "".join(text.lower().split()).replace("ſ", "s")
+    return "caps" in t or "avem" in t
 
 # ---------- Utils accents ----------
+class _AccentFoldTable(dict):
+    """
+    Table pour str.translate : code point -> caractère sans accents (NFD sans marques combinantes).
+    Les code points absents sont calculés à la demande puis mémorisés.
+    """
+    def __missing__(self, cp: int) -> str:
+        folded = "".join(c for c in unicodedata.normalize("NFD", chr(cp)) if not unicodedata.combining(c))
+        self[cp] = folded
+        return folded
+
+# Pré-remplie à l'import (héritée par les workers forkés) : Latin-1 + Latin étendu A (accents français
+# et voisins), ponctuation générale (espaces fines, apostrophe et guillemets typographiques) et symboles monétaires
+_ACCENT_FOLD = _AccentFoldTable()
+for _start, _end in ((0x00A0, 0x0180), (0x2000, 0x2070), (0x20A0, 0x20C0)):
+    for _cp in range(_start, _end):
+        _ACCENT_FOLD[_cp]
+
 def strip_accents(s: str) -> str:
     if s is None:
         return ""
-    return "".join(c for c in unicodedata.normalize("NFD", s) if not unicodedata.combining(c))
+    if s.isascii():
+        return s
+    return s.translate(_ACCENT_FOLD)
 
 # ---------- Extraction 1re page ----------
-def element_text_runs(el) -> str:
-    texts = []
-    for t in safe_xpath(el, ".//w:t"):
+# Lecture directe du ZIP (word/document.xml en streaming via iterparse) : pas de DOM complet python-docx.
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS_PART = "word/_rels/document.xml.rels"
+REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+# DOCX jusqu'à cette taille lus en une seule lecture séquentielle (BytesIO) plutôt qu'en petites lectures
+# aléatoires (répertoire central, en-têtes locaux...) : utile sur partage réseau (NFS/SMB) ; le fichier
+# est de toute façon relu en entier par la copie. Au-delà (images embarquées), accès direct au fichier.
+INMEMORY_DOCX_MAX_BYTES = 8 * 1024 * 1024
+
+def qn(tag: str) -> str:
+    """'w:type' -> '{namespace}type' (équivalent de docx.oxml.ns.qn, limité à NS + 'r')."""
+    prefix, local = tag.split(":", 1)
+    uri = REL_NS if prefix == "r" else NS[prefix]
+    return f"{{{uri}}}{local}"
+
+W_BODY = qn("w:body")
+W_P = qn("w:p")
+W_TBL = qn("w:tbl")
+W_PPR = qn("w:pPr")
+W_SECTPR = qn("w:sectPr")
+W_HEADER_REF = qn("w:headerReference")
+W_FOOTER_REF = qn("w:footerReference")
+W_BR = qn("w:br")
+W_LAST_RENDERED_PAGE_BREAK = qn("w:lastRenderedPageBreak")
+W_TXBX_CONTENT = qn("w:txbxContent")
+W_TYPE = qn("w:type")
+R_ID = qn("r:id")
+
+def paragraph_text(p, limit: int = 0) -> str:
+    """
+    Texte d'un paragraphe : runs concaténés (un mot peut être coupé sur plusieurs w:t).
+    `limit` > 0 : on arrête d'accumuler dès que `limit` caractères sont atteints.
+    """
+    if not limit:
+        return "".join(t.text for t in safe_xpath(p, XPATH_T) if t.text)
+    runs = []
+    size = 0
+    for t in safe_xpath(p, XPATH_T):
         if t.text:
-            texts.append(t.text)
-    return "\n".join(texts)
+            runs.append(t.text)
+            size += len(t.text)
+            if size >= limit:
+                break
+    return "".join(runs)
+
+def element_text_runs(el, limit: int = 0) -> str:
+    """
+    Texte d'un élément (paragraphe, tableau, textbox...) : un paragraphe par ligne.
+    `limit` > 0 : borne la taille du texte construit (un grand tableau n'est pas lu en entier).
+    """
+    if el.tag == W_P:
+        return paragraph_text(el, limit)
+    lines = []
+    size = 0
+    for p in safe_xpath(el, XPATH_P):
+        line = paragraph_text(p, limit - size if limit else 0)
+        if line:
+            lines.append(line)
+            size += len(line) + 1
+            if limit and size >= limit:
+                break
+    return "\n".join(lines)
+
+def paragraph_has_page_break(p, rendered_page_breaks: bool = False) -> bool:
+    """
+    Saut de page explicite (w:br type="page") ; avec rendered_page_breaks, aussi le marqueur
+    w:lastRenderedPageBreak (saut de page "naturel" mémorisé par Word au dernier rendu).
+    """
+    # iter() (parcours natif lxml) : ~2x plus rapide qu'un XPath quand l'élément est absent (cas courant)
+    for br in p.iter(W_BR):
+        if (br.get(W_TYPE) or "").lower() == "page":
+            return True
+    if rendered_page_breaks and next(p.iter(W_LAST_RENDERED_PAGE_BREAK), None) is not None:
+        return True
+    return False
+
+SECT_PR_SCAN_BLOCK = 1024 * 1024
+
+def scan_first_sect_pr(z: zipfile.ZipFile, nsmap: dict):
+    """
+    Premier w:sectPr de word/document.xml trouvé par simple recherche d'octets (flux décompressé par blocs),
+    puis seul ce fragment est parsé : évite d'analyser en XML toute la fin d'un long document pour
+    atteindre le w:sectPr final. `nsmap` : namespaces déclarés sur la racine du document.
+    Retourne None si le fragment ne peut pas être isolé ou parsé (l'appelant poursuit alors l'iterparse).
+    """
+    prefix = next((pfx for pfx, uri in nsmap.items() if uri == NS["w"] and pfx), None)
+    if prefix is None:
+        return None
+    tag = prefix.encode("ascii") + b":sectPr"
+    marker = re.compile(rb"<(/?)" + re.escape(tag) + rb"(?=[\s/>])")
+
+    buf = b""
+    found = False
+    pos = 0
+    depth = 0
+    try:
+        with z.open(DOCUMENT_PART) as f:
+            for block in iter(lambda: f.read(SECT_PR_SCAN_BLOCK), b""):
+                buf += block
+                if not found:
+                    m = marker.search(buf)
+                    if m is None:
+                        buf = buf[-(len(tag) + 2):]   # un marqueur peut être coupé entre deux blocs
+                        continue
+                    buf = buf[m.start():]
+                    found = True
+                # Balise ouvrante/fermante (w:sectPr peut contenir un w:sectPr dans w:sectPrChange)
+                for m in marker.finditer(buf, pos):
+                    end = buf.find(b">", m.end())
+                    if end < 0:
+                        break   # balise incomplète : bloc suivant
+                    if m.group(1):
+                        depth -= 1
+                    elif buf[end - 1:end] != b"/":
+                        depth += 1
+                    pos = end + 1
+                    if depth == 0:
+                        decls = " ".join(f'xmlns:{pfx}="{uri}"' if pfx else f'xmlns="{uri}"'
+                                         for pfx, uri in nsmap.items())
+                        wrapper = etree.fromstring(f"<root {decls}>".encode("utf-8") + buf[:pos] + b"</root>")
+                        return wrapper[0]
+    except (etree.XMLSyntaxError, zipfile.BadZipFile, OSError, ValueError):
+        pass
+    return None
 
-def extract_header_footer_text(doc: Document) -> str:
+def read_part_targets(z: zipfile.ZipFile) -> dict:
+    """Relations de document.xml : rId -> nom de la part dans le ZIP (ex: word/header1.xml)."""
+    try:
+        rels = etree.fromstring(z.read(DOCUMENT_RELS_PART))
+    except KeyError:
+        return {}
+    targets = {}
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target") or ""
+        if target.startswith("/"):
+            name = target.lstrip("/")
+        else:
+            name = posixpath.normpath(posixpath.join("word", target))
+        targets[rel.get("Id")] = name
+    return targets
+
+def extract_header_footer_text(z: zipfile.ZipFile, sect_pr) -> str:
+    """Texte des header/footer 'default' de la section (paragraphes + tables de 1er niveau)."""
+    if sect_pr is None:
+        return ""
     parts = []
     try:
-        sec = doc.sections[0]
-        if getattr(sec, "header", None):
-            for p in sec.header.paragraphs:
-                if p.text:
-                    parts.append(p.text)
-            for tbl in safe_xpath(sec.header._element, ".//w:tbl"):
-                parts.append(element_text_runs(tbl))
-        if getattr(sec, "footer", None):
-            for p in sec.footer.paragraphs:
-                if p.text:
-                    parts.append(p.text)
-            for tbl in safe_xpath(sec.footer._element, ".//w:tbl"):
-                parts.append(element_text_runs(tbl))
+        targets = None
+        names = None
+        seen = set()
+        for ref in sect_pr:
+            if ref.tag not in (W_HEADER_REF, W_FOOTER_REF) or ref.get(W_TYPE) != "default":
+                continue
+            if targets is None:
+                targets = read_part_targets(z)
+                names = set(z.namelist())   # répertoire central déjà lu à l'ouverture du ZIP
+            name = targets.get(ref.get(R_ID))
+            # Part absente (relation cassée) ou déjà lue : on passe sans perdre les suivantes
+            if not name or name not in names or name in seen:
+                continue
+            seen.add(name)
+            root = etree.fromstring(z.read(name))
+            for el in root:
+                if el.tag in (W_P, W_TBL):
+                    parts.append(element_text_runs(el))
     except Exception:
         pass
     return "\n".join(filter(None, parts))
 
-def extract_first_page_text(docx_path: Path, char_limit: int) -> str:
+def iter_first_page_chunks(docx_path: Path, char_limit: int, rendered_page_breaks: bool = False) -> Iterator[str]:
     """
-    "Approx first page" robuste :
-      - header/footer section 1
+    "Approx first page" robuste, bloc par bloc (permet un arrêt anticipé côté appelant) :
       - corps du document : paragraphs + tables + textboxes
-      - stop au 1er saut de page ou à char_limit
+      - stop au 1er saut de page (ou w:lastRenderedPageBreak si rendered_page_breaks),
+        à la fin de la section 1, ou à char_limit (blocs tronqués au budget restant)
+      - puis header/footer section 1 (hors budget)
+    Le corps est lu en streaming ; après l'arrêt, le 1er w:sectPr (fin de la section 1, porteur de ses
+    header/footer) est cherché par scan d'octets (scan_first_sect_pr), sinon en poursuivant l'iterparse.
     """
-    doc = Document(str(docx_path))
-    parts = []
+    total_len = 0
+    collecting = True
+    sect_pr = None
+    sect_pr_scanned = False
+
+    source = docx_path
+    if os.path.getsize(docx_path) <= INMEMORY_DOCX_MAX_BYTES:
+        with open(docx_path, "rb") as fh:
+            source = io.BytesIO(fh.read())
 
-    hf = extract_header_footer_text(doc)
-    if hf:
-        parts.append(hf)
-
-    total_len = sum(len(p) + 1 for p in parts)
-    body = doc.element.body
-
-    for child in body.iterchildren():
-        tag = child.tag.rsplit("}", 1)[-1].lower()
-
-        if tag == "p":
-            p_txt = element_text_runs(child)
-            if p_txt:
-                parts.append(p_txt)
-                total_len += len(p_txt) + 1
-            for br in safe_xpath(child, ".//w:br"):
-                br_type = br.get(qn("w:type"))
-                if (br_type or "").lower() == "page":
-                    return "\n".join(parts)
-
-        elif tag == "tbl":
-            t_txt = element_text_runs(child)
-            if t_txt:
-                parts.append(t_txt)
-                total_len += len(t_txt) + 1
-
-        # Textboxes (contenu texte encapsulé)
-        txbx_chunks = []
-        for txbx in safe_xpath(child, ".//w:txbxContent"):
-            txbx_chunks.append(element_text_runs(txbx))
-        if txbx_chunks:
-            tx = "\n".join(filter(None, txbx_chunks))
-            if tx:
-                parts.append(tx)
-                total_len += len(tx) + 1
-
-        if total_len >= char_limit:
-            break
-
-    return "\n".join(parts)[:char_limit]
+    with zipfile.ZipFile(source) as z:
+        with z.open(DOCUMENT_PART) as f:
+            for _, child in etree.iterparse(f, events=("end",), tag=(W_P, W_TBL, W_SECTPR)):
+                parent = child.getparent()
+                if parent is None:
+                    continue
+
+                # Fin de la section 1 : w:sectPr de 1er niveau, ou porté par le w:pPr d'un paragraphe
+                # (dans ce cas on termine d'abord ce paragraphe, qui appartient encore à la section 1)
+                if child.tag == W_SECTPR:
+                    if parent.tag == W_BODY or parent.tag == W_PPR:
+                        sect_pr = child
+                        if parent.tag == W_BODY or not collecting:
+                            break
+                    continue
+
+                if parent.tag != W_BODY:
+                    continue
+
+                if collecting:
+                    # Texte construit au plus sur le budget restant, puis tronqué exactement ci-dessous
+                    remaining = char_limit - total_len
+                    chunks = []
+                    page_break = False
+                    if child.tag == W_P:
+                        chunks.append(element_text_runs(child, remaining))
+                        page_break = paragraph_has_page_break(child, rendered_page_breaks)
+                    elif child.tag == W_TBL:
+                        chunks.append(element_text_runs(child, remaining))
+
+                    # Textboxes (contenu texte encapsulé)
+                    txbx_chunks = []
+                    for txbx in child.iter(W_TXBX_CONTENT):
+                        txbx_chunks.append(element_text_runs(txbx, remaining))
+                    if txbx_chunks:
+                        chunks.append("\n".join(filter(None, txbx_chunks)))
+
+                    for chunk in chunks:
+                        if not chunk or total_len >= char_limit:
+                            continue
+                        chunk = chunk[:char_limit - total_len]
+                        total_len += len(chunk) + 1
+                        yield chunk
+
+                    if page_break or total_len >= char_limit:
+                        collecting = False
+
+                # Collecte terminée, section 1 pas encore close : son w:sectPr est le 1er du flux restant
+                if not collecting and sect_pr is None and not sect_pr_scanned:
+                    sect_pr_scanned = True
+                    sect_pr = scan_first_sect_pr(z, child.getroottree().getroot().nsmap)
+
+                if sect_pr is not None:
+                    break
+
+                # Libère les éléments déjà traités (mémoire bornée)
+                child.clear()
+                while child.getprevious() is not None:
+                    del parent[0]
+
+        hf = extract_header_footer_text(z, sect_pr)
+        if hf:
+            yield hf
+
+def extract_first_page_text(docx_path: Path, char_limit: int, rendered_page_breaks: bool = False) -> str:
+    return "\n".join(iter_first_page_chunks(docx_path, char_limit, rendered_page_breaks))
+
+# ---------- Parcours des fichiers ----------
+def iter_docx(root: Path, recursive: bool) -> Iterator[os.DirEntry]:
+    """Liste les .docx via os.scandir (DirEntry : pas de fnmatch ni de Path par entrée ; liens de dossiers non suivis)."""
+    stack = [str(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".docx"):  # même sensibilité à la casse que glob("*.docx")
+                    yield entry
 
 # ---------- Copies ----------
+# Dossiers déjà créés dans ce processus (hérités par les workers forkés après ensure_dirs)
+_ENSURED_DIRS = set()
+
+def ensure_dir(d: Path):
+    """mkdir -p une seule fois par dossier et par processus (pas d'appel système par fichier copié)."""
+    if d not in _ENSURED_DIRS:
+        d.mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(d)
+
 def ensure_dirs(base_out: Path):
-    (base_out / "edb").mkdir(parents=True, exist_ok=True)
-    (base_out / "ndc").mkdir(parents=True, exist_ok=True)
-    (base_out / "autres").mkdir(parents=True, exist_ok=True)
+    ensure_dir(base_out / "edb")
+    ensure_dir(base_out / "ndc")
+    ensure_dir(base_out / "autres")
+
+# ioctl FICLONE (Linux) : clone copy-on-write (btrfs, XFS, ...), aucune donnée recopiée
+FICLONE = 0x40049409
+
+def copy_data(src: Path, dst: Path):
+    """
+    Copie du contenu seul. Linux : os.copy_file_range (copie dans le noyau, reflink sur Btrfs/XFS,
+    copie côté serveur sur NFS 4.2) ; repli sur shutil.copyfile (sendfile / fcopyfile / tampon) sinon,
+    y compris si copy_file_range s'arrête avant la fin (retour 0 : procfs/FUSE, certains noyaux entre FS).
+    """
+    if hasattr(os, "copy_file_range"):
+        try:
+            with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                remaining = os.fstat(fsrc.fileno()).st_size
+                while remaining > 0:
+                    copied = os.copy_file_range(fsrc.fileno(), fdst.fileno(), remaining)
+                    if copied == 0:
+                        break
+                    remaining -= copied
+            if remaining == 0:
+                return
+        except OSError:
+            pass  # ENOSYS, EXDEV (noyau < 5.3), EINVAL (FS non supporté)... : copyfile réécrit dst
+    # Copie incomplète ou impossible : copyfile réécrit dst en entier
+    shutil.copyfile(src, dst)
+
+def copy_file(src: Path, dst: Path, copy_mode: str = DEFAULT_COPY_MODE) -> str:
+    """
+    Copie src -> dst selon copy_mode et renvoie la méthode effectivement utilisée :
+      - copy : contenu (copy_data) + dates/permissions (shutil.copystat), comme shutil.copy2
+      - copyfile : contenu seul (copy_data)
+      - hardlink / reflink / symlink : retombent sur "copy" si impossible
+        (autre système de fichiers, FS sans reflink, OS sans symlink...).
+    """
+    if os.path.lexists(dst):
+        dst.unlink()
+    if copy_mode == "copyfile":
+        copy_data(src, dst)
+        return copy_mode
+    if copy_mode != "copy":
+        try:
+            if copy_mode == "hardlink":
+                os.link(src, dst)
+            elif copy_mode == "symlink":
+                os.symlink(src.resolve(), dst)
+            elif copy_mode == "reflink":
+                import fcntl
+                with open(src, "rb") as fsrc, open(dst, "wb") as fdst:
+                    fcntl.ioctl(fdst.fileno(), FICLONE, fsrc.fileno())
+                shutil.copystat(src, dst)
+            else:
+                raise ValueError(f"copy_mode invalide: {copy_mode}")
+            return copy_mode
+        except (OSError, ImportError):
+            if os.path.lexists(dst):
+                dst.unlink()
+    copy_data(src, dst)
+    shutil.copystat(src, dst)
+    return "copy"
+
+def reserve_path(path: Path) -> bool:
+    """
+    Crée path (fichier vide) avec O_EXCL : test d'existence et création en un seul appel système.
+    True si l'appelant a obtenu le nom, False s'il existait déjà (ou venait d'être pris par un autre worker).
+    """
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666))
+        return True
+    except FileExistsError:
+        return False
+
+def reserve_suffixed(dst: Path, run_ts: str) -> Path:
+    """Réserve le premier nom libre parmi <stem>_<run_ts><ext>, puis <stem>_<run_ts>_<n><ext> (n = 1, 2...)."""
+    candidate = dst.with_name(f"{dst.stem}_{run_ts}{dst.suffix}")
+    n = 0
+    while not reserve_path(candidate):
+        n += 1
+        candidate = dst.with_name(f"{dst.stem}_{run_ts}_{n}{dst.suffix}")
+    return candidate
+
+def copy_into(src: Path, dst: Path, copy_mode: str = DEFAULT_COPY_MODE) -> str:
+    """
+    Copie src dans un fichier temporaire du dossier de dst, puis le renomme sur dst (os.replace, atomique) :
+    dst (réservation vide ou version précédente) n'est jamais supprimé, un autre worker ne le voit jamais absent.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f".{dst.name}.", suffix=".tmp", dir=dst.parent)
+    os.close(fd)
+    tmp = Path(tmp)
+    try:
+        method = copy_file(src, tmp, copy_mode)
+        os.replace(tmp, dst)
+    except BaseException:
+        if os.path.lexists(tmp):
+            tmp.unlink()
+        raise
+    return method
 
-def safe_copy(src: Path, dst_dir: Path, on_exists: str):
-    dst_dir.mkdir(parents=True, exist_ok=True)
+def safe_copy(src: Path, dst_dir: Path, on_exists: str, run_ts: str, copy_mode: str = DEFAULT_COPY_MODE):
+    """
+    Copie src dans dst_dir selon on_exists, sans course entre workers/threads : la destination est réservée
+    par création exclusive avant la copie (deux sources homonymes avec --recursive ne visent jamais le même
+    fichier ; en skip, la première réservation gagne). run_ts : horodatage du lancement pour le mode suffix.
+    Retourne (destination, statut, méthode de copie effective ou "" si rien n'a été copié).
+    """
+    ensure_dir(dst_dir)
     dst = dst_dir / src.name
-    if dst.exists():
-        if on_exists == "skip":
-            return dst, "skipped_existing"
-        elif on_exists == "overwrite":
-            shutil.copy2(src, dst)
-            return dst, "overwritten"
-        elif on_exists == "suffix":
-            stem, ext = src.stem, src.suffix
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            suffixed = dst_dir / f"{stem}_{ts}{ext}"
-            shutil.copy2(src, suffixed)
-            return suffixed, "copied_with_suffix"
-        else:
-            raise ValueError(f"on_exists invalide: {on_exists}")
+    reserved = reserve_path(dst)
+    if reserved:
+        target, status = dst, "copied"
+    elif on_exists == "skip":
+        return dst, "skipped_existing", ""
+    elif on_exists == "overwrite":
+        target, status = dst, "overwritten"
+    elif on_exists == "suffix":
+        target, status = reserve_suffixed(dst, run_ts), "copied_with_suffix"
+        reserved = True
     else:
-        shutil.copy2(src, dst)
-        return dst, "copied"
+        raise ValueError(f"on_exists invalide: {on_exists}")
+    try:
+        method = copy_into(src, target, copy_mode)
+    except BaseException:
+        if reserved and os.path.lexists(target):
+            target.unlink()   # réservation vide abandonnée
+        raise
+    return target, status, method
 
 # ---------- Détections ----------
 def detect_ndc_in_first_page(text: str) -> tuple[bool, str]:
-    m = NDC_REGEX.search(text or "")
+    m = NDC_REGEX.search(text) if text and may_contain_ndc(text) else None
     if m:
         return True, f"pattern:{m.group(0)} source:first_page"
     return False, ""
 
 def detect_ndc_in_filename(filename: str) -> tuple[bool, str]:
-    m = NDC_REGEX.search(filename or "")
+    m = NDC_REGEX.search(filename) if filename and may_contain_ndc(filename) else None
     if m:
         return True, f"pattern:{m.group(0)} source:filename"
     return False, ""
 
 def detect_edb_in_first_page(text: str) -> tuple[bool, str]:
     norm_text = strip_accents(text).lower()
-    for token in EDB_TOKENS:
-        if token in norm_text:
-            return True, f"contains_first_page:'{token}'"
-    return False, ""
-
-def detect_edb_phrases_in_filename(filename: str) -> tuple[bool, str]:
-    """EDB si le nom contient une des phrases EDB (insensible casse/accents)."""
-    norm_name = strip_accents(filename).lower()
-    for token in EDB_TOKENS:
-        if token in norm_name:
-            return True, f"filename_contains_phrase:'{token}'"
+    m = EDB_TOKENS_REGEX.search(norm_text)
+    if m:
+        return True, f"contains_first_page:'{m.group(0)}'"
     return False, ""
 
-def detect_edb_abbrev_in_filename(filename: str) -> tuple[bool, str]:
+def detect_edb_in_filename(filename_lower: str) -> tuple[bool, str]:
     """
-    RÈGLE A (prudente) : EDB si le nom présente 'expr' (+ 'ession' optionnel) puis (optionnel 'de') puis 'besoin(s)',
-    avec séparateurs libres (. _ - espaces).
+    EDB si le nom contient une des phrases EDB, sinon l'abréviation (RÈGLE A, prudente) :
+    'expr' (+ 'ession' optionnel) puis (optionnel 'de') puis 'besoin(s)', séparateurs libres (. _ - espaces).
+    `filename_lower` : nom déjà en minuscules ; accents retirés seulement s'il n'est pas ASCII.
     """
-    norm_name = strip_accents(filename).lower()
-    if EDB_NAME_ABBR_REGEX.search(norm_name):
-        return True, "filename_contains_abbrev:'expr...besoin(s)'"
-    return False, ""
+    norm_name = strip_accents(filename_lower)
+    # Phrases et abréviation contiennent toutes 'besoin' : test de sous-chaîne avant la regex
+    if "besoin" not in norm_name:
+        return False, ""
+    m = EDB_NAME_REGEX.search(norm_name)
+    if not m:
+        return False, ""
+    if m.lastgroup == "abbrev":
+        # Une phrase EDB plus loin dans le nom reste prioritaire sur l'abréviation
+        phrase = EDB_TOKENS_REGEX.search(norm_name, m.start() + 1)
+        if not phrase:
+            return True, "filename_contains_abbrev:'expr...besoin(s)'"
+        m = phrase
+    return True, f"filename_contains_phrase:'{m.group(0)}'"
 
 # ---------- Classification ----------
+def classify_by_name_only(filename_lower: str):
+    """
+    Règles 2 et 3 (nom seul, déjà en minuscules) : ("EDB", raison) ou None.
+    Sans la 1re page, la priorité de la règle 1 (NDC en 1re page) n'est pas vérifiée.
+    """
+    # 2) EDB si nom contient 'edb'
+    if "edb" in filename_lower:
+        return "EDB", "filename_contains:edb"
+
+    # 3) EDB si nom contient une des phrases EDB OU l'abréviation 'expr...besoin(s)'
+    edb_name, reason_name = detect_edb_in_filename(filename_lower)
+    if edb_name:
+        return "EDB", reason_name
+    return None
+
+@lru_cache(maxsize=8192)
+def filename_signals(filename: str) -> tuple:
+    """
+    Signaux tirés du seul nom (fonction pure, mémoïsée : noms répétés entre dossiers/versions) :
+    (résultat règles 2/3 ou None, 'eb' dans le nom, (NDC dans le nom, raison)).
+    """
+    filename_lower = filename.lower()
+    return (classify_by_name_only(filename_lower), "eb" in filename_lower, detect_ndc_in_filename(filename))
+
 def classify(first_page_text: str, filename: str, content_read_ok: bool) -> tuple[str, str]:
     """
     Respecte l'ordre demandé, avec fallback par nom si contenu illisible.
     """
-    filename_lower = (filename or "").lower()
+    by_name, eb_in_name, (ndc_name, reason_ndc_name) = filename_signals(filename or "")
 
-    # 1) NDC si code en première page (si lisible)
+    # Scan NDC de la 1re page calculé une seule fois (réutilisé aux règles 1 et 4)
     if content_read_ok:
         ndc_first, reason_ndc_first = detect_ndc_in_first_page(first_page_text)
-        if ndc_first:
-            return "NDC", reason_ndc_first
+    else:
+        ndc_first, reason_ndc_first = False, ""
 
-    # 2) EDB si nom contient 'edb'
-    if "edb" in filename_lower:
-        return "EDB", "filename_contains:edb"
+    # 1) NDC si code en première page (si lisible)
+    if ndc_first:
+        return "NDC", reason_ndc_first
 
-    # 3) EDB si nom contient une des phrases EDB OU l'abréviation 'expr...besoin(s)'
-    edb_name_phrase, reason_phrase = detect_edb_phrases_in_filename(filename)
-    if edb_name_phrase:
-        return "EDB", reason_phrase
-    edb_name_abbrev, reason_abbrev = detect_edb_abbrev_in_filename(filename)
-    if edb_name_abbrev:
-        return "EDB", reason_abbrev
+    # 2) + 3) EDB par le nom ('edb', phrases EDB, abréviation 'expr...besoin(s)')
+    if by_name:
+        return by_name
 
     # 4) EDB si nom contient 'eb' ET pas de code NDC en 1re page
-    if "eb" in filename_lower:
+    if eb_in_name:
         if content_read_ok:
-            ndc_first, _ = detect_ndc_in_first_page(first_page_text)
             if not ndc_first:
                 return "EDB", "filename_contains:eb AND no_ndc_on_first_page"
         else:
             return "EDB", "filename_contains:eb AND content_unreadable"
 
     # 5) NDC si code dans le nom
-    ndc_name, reason_ndc_name = detect_ndc_in_filename(filename)
     if ndc_name:
         return "NDC", reason_ndc_name
 
@@ -280,6 +701,201 @@ def classify(first_page_text: str, filename: str, content_read_ok: bool) -> tupl
     # 7) AUTRES
     return "AUTRES", ""
 
+def classify_without_text(filename: str, edb_names_first: bool, fast_filename_shortcut: bool):
+    """
+    Décision par le nom seul, quand une option l'autorise : (classe, raison) ou None (1re page à lire).
+      - edb_names_first : règles 2/3 décisives (la priorité de la règle 1 est alors perdue)
+      - fast_filename_shortcut : code NDC dans le nom et aucune règle EDB du nom (2/3/4) ->
+        NDC quelle que soit la 1re page (règle 1 ou règle 5) ; seule la raison change
+    """
+    by_name, eb_in_name, (ndc_name, reason_ndc_name) = filename_signals(filename)
+    if edb_names_first and by_name:
+        return by_name
+    if fast_filename_shortcut and ndc_name and not by_name and not eb_in_name:
+        return "NDC", reason_ndc_name
+    return None
+
+# ---------- Traitement unitaire (pour parallélisation) ----------
+def process_file(args: Tuple) -> dict:
+    """
+    Lit la 1re page, classe et copie un DOCX. Retourne l'enregistrement du rapport.
+    Si copy_in_worker est faux, la copie est laissée à l'appelant : le dossier cible est
+    renvoyé dans la clé "target_dir" (à retirer avant le rapport).
+    """
+    (path, base_out, on_exists, run_ts, copy_mode, char_limit, debug_dir,
+     edb_names_first, fast_filename_shortcut, copy_in_worker, rendered_page_breaks) = args
+    path = Path(path)
+    base_out = Path(base_out)
+
+    classification = "ERREUR"
+    reason = ""
+    dest_path = None
+    copy_status = "not_copied"
+    copy_method = ""
+    deferred_target = None
+
+    first_page = ""
+    content_read_ok = True
+
+    # Options --edb-names-first / --fast-filename-shortcut : décision par le nom, sans ouvrir le DOCX
+    by_name = classify_without_text(path.name, edb_names_first, fast_filename_shortcut)
+
+    # Lecture + extraction "1re page", arrêtée dès qu'un code NDC apparaît (règle 1, décisive)
+    # sauf si le texte complet est demandé pour le debug
+    if by_name is None:
+        try:
+            chunks = []
+            with closing(iter_first_page_chunks(path, char_limit, rendered_page_breaks)) as it:
+                for chunk in it:
+                    chunks.append(chunk)
+                    if not debug_dir and may_contain_ndc(chunk) and NDC_REGEX.search(chunk):
+                        break
+            first_page = "\n".join(chunks)
+            if debug_dir:
+                try:
+                    with open(Path(debug_dir) / f"{path.stem}.txt", "w", encoding="utf-8") as fdbg:
+                        fdbg.write(first_page)
+                except Exception:
+                    pass
+        except Exception as e:
+            # On continue malgré tout : fallback par nom
+            content_read_ok = False
+            reason = f"content_unreadable:{type(e).__name__}"
+
+    try:
+        # Classification
+        if by_name is not None:
+            cls, rsn = by_name[0], by_name[1] + " | first_page_not_read"
+        else:
+            cls, rsn = classify(first_page, path.name, content_read_ok)
+        if (not content_read_ok) and rsn:
+            rsn = rsn + " | " + reason
+        elif (not content_read_ok) and (not rsn):
+            rsn = reason or "content_unreadable"
+
+        classification, reason = cls, rsn
+
+        # Dossier cible
+        if classification == "EDB":
+            target_dir = base_out / "edb"
+        elif classification == "NDC":
+            target_dir = base_out / "ndc"
+        elif classification == "AUTRES":
+            target_dir = base_out / "autres"
+        else:
+            target_dir = None
+
+        if target_dir is not None:
+            if copy_in_worker:
+                dest_path, copy_status, copy_method = safe_copy(path, target_dir, on_exists, run_ts, copy_mode)
+            else:
+                deferred_target = str(target_dir)
+
+    except Exception as e:
+        classification = "ERREUR"
+        reason = f"exception:{type(e).__name__}: {e}"
+
+    record = {
+        "filename": path.name,
+        "original_path": str(path),
+        "classification": classification,
+        "reason": reason,
+        "destination_path": "" if dest_path is None else str(dest_path),
+        "copy_status": copy_status,
+        "copy_method": copy_method,
+    }
+    if deferred_target is not None:
+        record["target_dir"] = deferred_target
+    return record
+
+def apply_copy_result(record: dict, future: Future) -> dict:
+    """Reporte dans l'enregistrement le résultat d'une copie différée (--copy-threads)."""
+    try:
+        dest_path, record["copy_status"], record["copy_method"] = future.result()
+        record["destination_path"] = str(dest_path)
+    except Exception as e:
+        # Même traitement qu'une exception de copie dans le worker
+        record["classification"] = "ERREUR"
+        record["reason"] = f"exception:{type(e).__name__}: {e}"
+    return record
+
+# ---------- Rapport ----------
+REPORT_COLUMNS = ["filename", "original_path", "classification", "reason", "destination_path", "copy_status",
+                  "copy_method"]
+
+PARQUET_ROW_GROUP_SIZE = 10000
+
+class ReportWriter:
+    """
+    Rapport écrit ligne à ligne pendant le traitement (mémoire constante, rapport partiel si interruption) :
+      - csv : UTF-8 avec BOM (ouverture directe dans Excel)
+      - xlsx : openpyxl write-only (lignes sérialisées au fil de l'eau), enregistré à la fermeture
+      - parquet : pyarrow (optionnel), groupes de PARQUET_ROW_GROUP_SIZE lignes
+    """
+    def __init__(self, report_path: Path, report_format: str):
+        self.report_path = report_path
+        self.report_format = report_format
+        self.rows = 0
+        if report_format == "xlsx":
+            from openpyxl import Workbook  # uniquement requis pour --report-format xlsx
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet("Sheet1")
+            self._ws.append(REPORT_COLUMNS)
+        elif report_format == "parquet":
+            import pyarrow as pa  # optionnel : uniquement requis pour --report-format parquet
+            import pyarrow.parquet as pq
+            self._pa = pa
+            self._schema = pa.schema([(c, pa.string()) for c in REPORT_COLUMNS])
+            self._pq_writer = pq.ParquetWriter(report_path, self._schema)
+            self._batch = []
+        else:
+            self._file = open(report_path, "w", newline="", encoding="utf-8-sig")
+            self._csv = csv.DictWriter(self._file, fieldnames=REPORT_COLUMNS)
+            self._csv.writeheader()
+
+    def write(self, record: dict):
+        self.rows += 1
+        if self.report_format == "xlsx":
+            self._ws.append([record[c] for c in REPORT_COLUMNS])
+        elif self.report_format == "parquet":
+            self._batch.append(record)
+            if len(self._batch) >= PARQUET_ROW_GROUP_SIZE:
+                self._flush_parquet()
+        else:
+            self._csv.writerow(record)
+
+    def _flush_parquet(self):
+        if self._batch:
+            self._pq_writer.write_table(self._pa.Table.from_pylist(self._batch, schema=self._schema))
+            self._batch = []
+
+    def close(self):
+        if self.report_format == "xlsx":
+            self._wb.save(self.report_path)
+        elif self.report_format == "parquet":
+            self._flush_parquet()
+            self._pq_writer.close()
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
+
+# ---------- Logging ----------
+def setup_logging(flush_every: int):
+    """
+    Logs sur stdout via un MemoryHandler : une écriture toutes les `flush_every` lignes
+    (et immédiatement pour WARNING+), vidé à la sortie par logging.shutdown().
+    """
+    stream = logging.StreamHandler(sys.stdout)
+    stream.setFormatter(logging.Formatter("%(asctime)s - %(levelname)s - %(message)s"))
+    handler = logging.handlers.MemoryHandler(max(1, flush_every), flushLevel=logging.WARNING, target=stream)
+    logging.basicConfig(level=logging.INFO, handlers=[handler])
+
 # ---------- Main ----------
 def main():
     parser = argparse.ArgumentParser(description="Classement DOCX en EDB / NDC / AUTRES (1ère page + nom).")
@@ -289,13 +905,40 @@ def main():
                         help="Dossier racine de sortie (défaut: classified_docx)")
     parser.add_argument("--on-exists", choices=["skip", "overwrite", "suffix"], default=DEFAULT_ON_EXISTS,
                         help="Politique en cas de collision de nom (défaut: skip)")
+    parser.add_argument("--copy-mode", choices=["copy", "copyfile", "hardlink", "reflink", "symlink"], default=DEFAULT_COPY_MODE,
+                        help="Mode de copie vers classified_docx (défaut: copy ; copyfile = contenu seul, sans dates ; "
+                             "liens : repli sur copy si impossible, méthode réelle dans la colonne copy_method)")
     parser.add_argument("--recursive", action="store_true",
                         help="Parcourir récursivement le dossier d'entrée")
     parser.add_argument("--first-page-char-limit", type=int, default=DEFAULT_FIRST_PAGE_CHAR_LIMIT,
                         help="Troncature si pas de saut de page explicite (défaut: 12000)")
+    parser.add_argument("--stop-at-rendered-page-break", action="store_true",
+                        help="Arrête aussi la 1re page au marqueur w:lastRenderedPageBreak (saut de page naturel "
+                             "enregistré par Word) : texte plus proche de la vraie 1re page, lecture plus courte")
     parser.add_argument("--debug-first-pages", action="store_true",
                         help="Sauvegarde le texte extrait (approx. 1ère page) dans classified_docx/_debug_first_pages")
+    parser.add_argument("--report-format", choices=["csv", "xlsx", "parquet"], default=DEFAULT_REPORT_FORMAT,
+                        help="Format du rapport classify_report (défaut: csv)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Nombre de workers (défaut: 0 = auto)")
+    parser.add_argument("--edb-names-first", action="store_true",
+                        help="EDB par le nom (règles 2/3) sans lire le DOCX : plus rapide, mais un code NDC "
+                             "en 1re page (règle 1) n'est alors plus prioritaire pour ces fichiers")
+    parser.add_argument("--copy-threads", type=int, default=DEFAULT_COPY_THREADS,
+                        help="Copies faites par N threads du processus principal, en parallèle de la lecture "
+                             "(défaut: 0 = copie dans chaque worker)")
+    parser.add_argument("--fast-filename-shortcut", action="store_true",
+                        help="Code NDC dans le nom sans indice EDB (edb, expr...besoin, eb) : NDC sans lire le DOCX "
+                             "(même classe, raison tirée du nom)")
+    parser.add_argument("--log-flush-every", type=int, default=DEFAULT_LOG_FLUSH_EVERY,
+                        help=f"Lignes de progression écrites par paquets de N (défaut: {DEFAULT_LOG_FLUSH_EVERY}, 1 = immédiat)")
     args = parser.parse_args()
+    if args.report_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401  (vérifié avant de traiter les fichiers)
+        except ImportError:
+            parser.error("--report-format parquet nécessite pyarrow (pip install pyarrow)")
+    setup_logging(args.log_flush_every)
 
     in_dir = Path(args.docx_dir).resolve()
     base_out = Path(args.output_dir).resolve()
@@ -305,89 +948,84 @@ def main():
     if args.debug_first_pages:
         debug_dir.mkdir(parents=True, exist_ok=True)
 
-    candidates = list(in_dir.rglob("*.docx")) if args.recursive else list(in_dir.glob("*.docx"))
+    candidates = list(iter_docx(in_dir, args.recursive))
+    # Tri en place sur le nom de fichier, départagé par le chemin complet (homonymes de --recursive) :
+    # ordre du rapport et homonyme retenu en skip reproductibles quel que soit l'ordre de scandir
+    candidates.sort(key=lambda e: (e.name.lower(), e.path.lower()))
 
-    records = []
     total = len(candidates)
-    print(f"[INFO] {total} fichier(s) .docx à traiter dans: {in_dir}")
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    # Pas plus de processus que de fichiers (petits lots : démarrage du pool inutilement coûteux)
+    workers = max(1, min(workers, total))
+    logger.info(f"{total} fichier(s) .docx à traiter dans: {in_dir} ({workers} workers, regex NDC: {NDC_REGEX_ENGINE})")
 
-    for i, path in enumerate(sorted(candidates, key=lambda p: str(p).lower()), start=1):
-        try:
-            rel = path.relative_to(in_dir)
-        except Exception:
-            rel = path.name
+    # Horodatage anti-collision (--on-exists suffix) calculé une fois pour tout le lancement
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    tasks = [
+        (entry.path, str(base_out), args.on_exists, run_ts, args.copy_mode, args.first_page_char_limit,
+         str(debug_dir) if args.debug_first_pages else "", args.edb_names_first, args.fast_filename_shortcut,
+         args.copy_threads <= 0, args.stop_at_rendered_page_break)
+        for entry in candidates
+    ]
 
-        classification = "ERREUR"
-        reason = ""
-        dest_path = None
-        copy_status = "not_copied"
+    # Linux : workers forkés -> regex, XPath et table d'accents compilés à l'import sont hérités
+    # tels quels (pas de ré-import par worker, y compris si le défaut devient forkserver).
+    # Ailleurs (spawn), chaque worker les compile une seule fois en important le module.
+    mp_context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
 
-        first_page = ""
-        content_read_ok = True
+    # Chemin affiché relatif à --docx-dir : simple découpe de chaîne (pas de Path ni relative_to par fichier)
+    in_dir_prefix = os.path.join(str(in_dir), "")
 
-        # Lecture + extraction "1re page"
-        try:
-            first_page = extract_first_page_text(path, char_limit=args.first_page_char_limit)
-            if args.debug_first_pages:
-                try:
-                    with open(debug_dir / f"{path.stem}.txt", "w", encoding="utf-8") as fdbg:
-                        fdbg.write(first_page)
-                except Exception:
-                    pass
-        except Exception as e:
-            # On continue malgré tout : fallback par nom
-            content_read_ok = False
-            reason = f"content_unreadable:{type(e).__name__}"
+    def emit(record: dict):
+        original_path = record["original_path"]
+        if original_path.startswith(in_dir_prefix):
+            rel = original_path[len(in_dir_prefix):]
+        else:
+            rel = record["filename"]
+        report.write(record)
+        logger.info(f"[{report.rows}/{total}] {rel} -> {record['classification']} "
+                    f"({record['reason'] or 'no_reason'})")
 
-        try:
-            # Classification
-            cls, rsn = classify(first_page, path.name, content_read_ok)
-            if (not content_read_ok) and rsn:
-                rsn = rsn + " | " + reason
-            elif (not content_read_ok) and (not rsn):
-                rsn = reason or "content_unreadable"
-
-            classification, reason = cls, rsn
-
-            # Dossier cible
-            if classification == "EDB":
-                target_dir = base_out / "edb"
-            elif classification == "NDC":
-                target_dir = base_out / "ndc"
-            elif classification == "AUTRES":
-                target_dir = base_out / "autres"
-            else:
-                target_dir = None
+    # --copy-threads N : les workers lisent/classent, les copies (I/O) partent sur N threads du parent
+    # et se recouvrent avec le parsing des fichiers suivants. Résultats émis dans l'ordre des tâches.
+    copy_pool = ThreadPoolExecutor(max_workers=args.copy_threads) if args.copy_threads > 0 else nullcontext()
 
-            if target_dir is not None:
-                dest_path, copy_status = safe_copy(path, target_dir, args.on_exists)
+    # Rapport -> parent de --docx-dir (ex: datas/classify_report.csv, .xlsx / .parquet selon --report-format),
+    # alimenté au fil des résultats
+    report_path = in_dir.parent / f"classify_report.{args.report_format}"
 
-            print(f"[{i}/{total}] {rel} -> {classification} ({reason or 'no_reason'})")
+    # map() conserve l'ordre des tâches : rapport et affichage restent déterministes
+    with ReportWriter(report_path, args.report_format) as report, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor, copy_pool:
+        pending = deque()   # (enregistrement, copie en cours ou None, destination), dans l'ordre des tâches
+        # Dernière copie soumise par destination : deux homonymes (--recursive, triés côte à côte) sont copiés
+        # l'un après l'autre, dans l'ordre des tâches -> en skip/suffix, le premier fichier garde toujours le nom
+        inflight = {}
 
-        except Exception as e:
-            classification = "ERREUR"
-            reason = f"exception:{type(e).__name__}: {e}"
-            print(f"[{i}/{total}] {rel} -> ERREUR ({reason})")
-
-        records.append({
-            "filename": path.name,
-            "original_path": str(path),
-            "classification": classification,
-            "reason": reason,
-            "destination_path": "" if dest_path is None else str(dest_path),
-            "copy_status": copy_status,
-        })
-
-    # Rapport Excel -> parent de --docx-dir (ex: datas/classify_report.xlsx)
-    repo_root = in_dir.parent
-    report_path = repo_root / "classify_report.xlsx"
-    df = pd.DataFrame.from_records(
-        records,
-        columns=["filename", "original_path", "classification", "reason", "destination_path", "copy_status"],
-    )
-    df.to_excel(report_path, index=False)
-    print(f"[OK] Rapport écrit : {report_path}")
-    print("[OK] Terminé.")
+        def emit_done(record: dict, future, key):
+            if future is not None and inflight.get(key) is future:
+                del inflight[key]
+            emit(record if future is None else apply_copy_result(record, future))
+
+        for record in executor.map(process_file, tasks, chunksize=8):
+            target_dir = record.pop("target_dir", None)
+            future = key = None
+            if target_dir is not None:
+                key = os.path.join(target_dir, record["filename"])
+                previous = inflight.get(key)
+                if previous is not None:
+                    wait([previous])
+                future = copy_pool.submit(safe_copy, Path(record["original_path"]), Path(target_dir),
+                                          args.on_exists, run_ts, args.copy_mode)
+                inflight[key] = future
+            pending.append((record, future, key))
+            while pending and (pending[0][1] is None or pending[0][1].done()):
+                emit_done(*pending.popleft())
+        while pending:
+            emit_done(*pending.popleft())
+
+    logger.info(f"Rapport écrit : {report_path}")
+    logger.info("Terminé.")
 
 
 if __name__ == "__main__":
@@ -15,29 +15,200 @@ Usage :
     python clean_extension.py --raw ./raw --out-name inventaire_raw.xlsx
 
 Dépendances :
-    - pandas
     - openpyxl
+    - xlsxwriter (optionnel)
 """
 
 import argparse
+import os
+from concurrent.futures import ThreadPoolExecutor
+import queue
+import threading
 from pathlib import Path
 from datetime import datetime
 import shutil
-import pandas as pd
 
-ALLOWED_EXT = {".pdf", ".doc", ".docx"}  # insensible à la casse
+try:
+    import fcntl  # POSIX uniquement (clonage reflink)
+except ImportError:
+    fcntl = None
+
+ALLOWED_EXT = frozenset({".pdf", ".doc", ".docx"})  # insensible à la casse
 DEFAULT_RAW_REL = "raw"
 DEFAULT_REPORT_NAME = "inventaire_raw.xlsx"
+# ioctl Linux FICLONE (= cp --reflink=auto) : sur Btrfs/XFS/ZFS, la copie partage les blocs (copy-on-write), en O(1)
+FICLONE = 0x40049409
+# Tampon du repli copyfileobj : shutil.COPY_BUFSIZE vaut 64 Kio sous POSIX, trop peu pour des copies
+# séquentielles de fichiers entiers (surtout sur partage réseau/SMB) ; 1 Mio divise ~16x le nombre de read/write.
+DEFAULT_BUFFER_SIZE = 1024 * 1024
+# Copies en parallèle : read/write/sendfile relâchent le GIL, plusieurs copies recouvrent leurs latences disque/réseau
+DEFAULT_THREADS = min(32, (os.cpu_count() or 1) * 4)
+INVENTORY_SHEET = "Inventaire"
+INVENTORY_COLUMNS = ["Nom du fichier", "Extension", "Action"]
+
+def candidate_paths(dest_path, run_ts):
+    """
+    Noms essayés pour la copie : <nom>, puis anti-collision <stem>_<run_ts><ext>,
+    puis <stem>_<run_ts>_<n><ext> avec n = 1, 2... (ex. deux lancements dans la même seconde).
+    """
+    yield dest_path
+    stem, suffix = dest_path.stem, dest_path.suffix
+    yield dest_path.with_name(f"{stem}_{run_ts}{suffix}")
+    n = 0
+    while True:
+        n += 1
+        yield dest_path.with_name(f"{stem}_{run_ts}_{n}{suffix}")
+
+def create_exclusive(dest_path, run_ts):
+    """
+    Crée le fichier de destination avec O_EXCL : test d'existence et création en un seul appel système,
+    sans course entre threads (ni avec un autre lancement). Retourne (chemin retenu, descripteur ouvert).
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    for candidate in candidate_paths(dest_path, run_ts):
+        try:
+            return candidate, os.open(candidate, flags, 0o666)
+        except FileExistsError:
+            continue
+
+def fast_copy(src, dest_path, run_ts, buffer_size=DEFAULT_BUFFER_SIZE):
+    """
+    Copie src vers dest_path (nom horodaté si déjà pris, voir create_exclusive) sans tampon en espace
+    utilisateur quand c'est possible, puis dates/permissions (copystat) :
+      0) clonage reflink (ioctl FICLONE) si raw/ et clean_extension/ sont sur le même volume CoW
+      1) os.copy_file_range (Linux : copie dans le noyau, reflink Btrfs/XFS, copie côté serveur NFS 4.2)
+      2) os.sendfile (Linux)
+      3) shutil.copyfileobj avec un tampon de buffer_size octets (repli portable)
+    Windows : shutil.copy2 (CopyFile2 natif) sur le fichier réservé.
+    Retourne le chemin de destination effectif.
+    """
+    with open(src, "rb", buffering=0) as fsrc:
+        dst, out_fd = create_exclusive(dest_path, run_ts)
+        if os.name == "nt":
+            os.close(out_fd)
+            shutil.copy2(src, dst)
+            return dst
+        with open(out_fd, "wb", buffering=0) as fdst:
+            in_fd = fsrc.fileno()
+            remaining = os.fstat(in_fd).st_size
+            if fcntl is not None and remaining > 0:
+                try:
+                    fcntl.ioctl(out_fd, FICLONE, in_fd)
+                    remaining = 0
+                except OSError:
+                    pass   # EXDEV, EOPNOTSUPP, EINVAL, ENOTTY... : copie classique
+            # Les deux appels avancent les positions des descripteurs : chaque repli reprend là où l'autre s'est arrêté
+            for zero_copy in (getattr(os, "copy_file_range", None), getattr(os, "sendfile", None)):
+                if zero_copy is None or remaining <= 0:
+                    continue
+                try:
+                    while remaining > 0:
+                        if zero_copy is os.sendfile:
+                            copied = os.sendfile(out_fd, in_fd, None, remaining)
+                        else:
+                            copied = zero_copy(in_fd, out_fd, remaining)
+                        if copied == 0:
+                            break
+                        remaining -= copied
+                except OSError:
+                    continue   # ENOSYS, EXDEV, EINVAL... : méthode suivante
+                break
+            if remaining > 0:
+                shutil.copyfileobj(fsrc, fdst, buffer_size)
+    shutil.copystat(src, dst)
+    return dst
+
+class InventoryWriter:
+    """
+    Écrit l'inventaire Excel ligne par ligne, sans DataFrame ni graphe de cellules en mémoire :
+      - xlsxwriter installé : mode constant_memory, chaque ligne est sérialisée puis libérée
+      - sinon : openpyxl en mode write_only (lignes sérialisées au fil de l'eau), enregistré à la fermeture
+    Sérialisation et enregistrement faits par un thread dédié (file de lignes) : après finish(),
+    l'Excel se termine pendant les copies ; close() attend le thread et relaie son éventuelle erreur.
+    """
+
+    def __init__(self, report_path):
+        self.report_path = report_path
+        self.rows = queue.Queue()
+        self.finished = False
+        self.drained = False
+        self.error = None
+        self.thread = threading.Thread(target=self._run, name="inventory-writer", daemon=True)
+        self.thread.start()
+
+    def _run(self):
+        try:
+            try:
+                import xlsxwriter
+            except ImportError:
+                xlsxwriter = None
+            if xlsxwriter is None:
+                from openpyxl import Workbook
+                workbook = Workbook(write_only=True)
+                worksheet = workbook.create_sheet(INVENTORY_SHEET)
+                worksheet.append(INVENTORY_COLUMNS)
+                for row in self._iter_rows():
+                    worksheet.append(row)
+                workbook.save(self.report_path)
+            else:
+                workbook = xlsxwriter.Workbook(str(self.report_path), {"constant_memory": True})
+                worksheet = workbook.add_worksheet(INVENTORY_SHEET)
+                worksheet.write_row(0, 0, INVENTORY_COLUMNS)
+                for row_idx, row in enumerate(self._iter_rows(), start=1):
+                    worksheet.write_row(row_idx, 0, row)
+                workbook.close()
+        except Exception as e:
+            self.error = e
+            # Vide la file jusqu'à finish() pour que les append() suivants ne s'accumulent pas
+            if not self.drained:
+                for _ in self._iter_rows():
+                    pass
+
+    def _iter_rows(self):
+        yield from iter(self.rows.get, None)
+        self.drained = True
+
+    def append(self, row):
+        self.rows.put(row)
+
+    def finish(self):
+        """Plus de lignes : le thread termine et enregistre le classeur en arrière-plan."""
+        if not self.finished:
+            self.finished = True
+            self.rows.put(None)
+
+    def close(self):
+        self.finish()
+        self.thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
 
 def main():
     parser = argparse.ArgumentParser(
-        description="Copie PDF/DOC/DOCX de ./raw vers le dossier frère clean_extension et génère un Excel d'inventaire."
+        description="Copie PDF/DOC/DOCX de ./raw vers le dossier frère clean_extension et génère un Excel d'inventaire. "
+                    "Sous Linux, les copies sont des clones reflink (copy-on-write, instantanés) quand le système "
+                    "de fichiers le permet (Btrfs, XFS, ZFS), sinon des copies noyau (copy_file_range/sendfile)."
     )
     parser.add_argument("--raw", type=str, default=DEFAULT_RAW_REL,
                         help="Chemin du sous-dossier raw (défaut: ./raw)")
     parser.add_argument("--out-name", type=str, default=DEFAULT_REPORT_NAME,
                         help="Nom du fichier Excel de sortie (défaut: inventaire_raw.xlsx)")
+    parser.add_argument("--buffer-size", type=int, default=DEFAULT_BUFFER_SIZE,
+                        help="Taille du tampon de copie en octets quand la copie noyau est indisponible (défaut: 1048576)")
+    parser.add_argument("--threads", type=int, default=DEFAULT_THREADS,
+                        help=f"Nombre de copies simultanées (défaut: {DEFAULT_THREADS} ; 1 = séquentiel)")
     args = parser.parse_args()
+    if args.buffer_size <= 0:
+        parser.error("--buffer-size doit être > 0")
+    if args.threads <= 0:
+        parser.error("--threads doit être > 0")
 
     cwd = Path.cwd()
     raw_dir = (cwd / args.raw).resolve()
@@ -51,45 +222,49 @@ def main():
     target_dir = (raw_dir.parent / "clean_extension").resolve()
     target_dir.mkdir(parents=True, exist_ok=True)
 
-    inventory_rows = []
+    copies = []   # (source, destination) : copies lancées après l'inventaire
+    # Horodatage anti-collision calculé une fois pour tout le lancement
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
     copied_count = 0
     ignored_count = 0
 
-    for entry in raw_dir.iterdir():
-        # Ignorer les sous-dossiers
-        if not entry.is_file():
-            continue
+    # os.scandir : nom et type servis par readdir (DirEntry met is_file en cache), sans objet Path par fichier
+    with os.scandir(raw_dir) as it:
+        entries = list(it)
 
-        ext = entry.suffix.lower()
-        filename = entry.name
-
-        if ext in ALLOWED_EXT:
-            # Copie vers clean_extension (à côté de raw)
-            dest_path = target_dir / filename
-            # Éviter l'écrasement si un fichier homonyme existe déjà
-            if dest_path.exists():
-                stem = dest_path.stem
-                new_name = f"{stem}_{datetime.now().strftime('%Y%m%d_%H%M%S')}{dest_path.suffix}"
-                dest_path = dest_path.with_name(new_name)
-
-            shutil.copy2(entry, dest_path)
-            action = "conserver"
-            copied_count += 1
-        else:
-            action = "ignorer"
-            ignored_count += 1
-
-        inventory_rows.append({
-            "Nom du fichier": filename,
-            "Extension": ext[1:] if ext.startswith(".") else ext,
-            "Action": action,
-        })
-
-    # Génération de l'Excel dans le dossier courant (où vous lancez le script)
+    # Excel généré dans le dossier courant (où vous lancez le script), lignes écrites au fil du parcours
     report_path = (cwd / args.out_name).resolve()
-    df = pd.DataFrame(inventory_rows, columns=["Nom du fichier", "Extension", "Action"])
-    with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-        df.to_excel(writer, sheet_name="Inventaire", index=False)
+    with InventoryWriter(report_path) as inventory:
+        for entry in entries:
+            # Ignorer les sous-dossiers (les liens symboliques vers des fichiers restent suivis, comme avant)
+            if not entry.is_file():
+                continue
+
+            filename = entry.name
+            # Extension comme Path.suffix ("..pdf" -> ".pdf" ; ".bashrc", "a." -> "") sans objet Path
+            dot = filename.rfind(".")
+            ext = filename[dot:].lower() if 0 < dot < len(filename) - 1 else ""
+
+            if ext in ALLOWED_EXT:
+                # Copie vers clean_extension (à côté de raw) ; pas d'écrasement si un fichier homonyme
+                # existe déjà : nom horodaté choisi à la création (O_EXCL, voir create_exclusive)
+                copies.append((entry.path, target_dir / filename))
+                action = "conserver"
+                copied_count += 1
+            else:
+                action = "ignorer"
+                ignored_count += 1
+
+            inventory.append((filename, ext[1:], action))
+
+        # Inventaire complet : l'Excel s'enregistre en arrière-plan pendant les copies
+        inventory.finish()
+
+        # Copies en parallèle ; max_workers borne aussi le nombre de descripteurs ouverts (2 par copie).
+        # map() relaie la première exception éventuelle, comme la boucle séquentielle.
+        with ThreadPoolExecutor(max_workers=max(1, min(args.threads, len(copies)))) as pool:
+            for _ in pool.map(lambda c: fast_copy(c[0], c[1], run_ts, args.buffer_size), copies):
+                pass
 
     print("✅ Traitement terminé.")
     print(f"   - Dossier source         : {raw_dir}")
@@ -18,9 +18,10 @@ Fonctionnement :
 - Parcours récursif des répertoires source
 - Conversion .docx -> .md (titres, gras, italique, listes, tableaux, paragraphes)
 - Politique en cas de collision : skip | overwrite | suffix
+- Parallélisation configurable via --workers (conversion + écriture par worker)
 
 Dépendances :
-- python-docx
+- lxml (lecture directe de word/document.xml, sans python-docx)
 - (standard library) pandas non requis ici
 
 Limitations :
@@ -29,62 +30,315 @@ Limitations :
 """
 
 import argparse
+from concurrent.futures import ProcessPoolExecutor
+import multiprocessing
+import os
 from pathlib import Path
 from datetime import datetime
-import unicodedata
+from itertools import chain
+import posixpath
 import re
+import stat
 import sys
+import tempfile
+from typing import Optional, Tuple
+import zipfile
 
-from docx import Document
+from lxml import etree
 
+# Nombre de workers (0 = auto = nombre de CPU)
+DEFAULT_WORKERS = 0
 
 # -------------------------
 # Helpers système / FS
 # -------------------------
+def iter_docx(src_dir: Path, recursive: bool):
+    """
+    Générateur des .docx de src_dir via os.scandir (type d'entrée servi par readdir, pas de fnmatch ;
+    même sensibilité à la casse que glob("*.docx"), liens de dossiers non suivis comme rglob).
+    Ignore les fichiers verrous Word (~$nom.docx), qui ne sont pas des DOCX valides.
+    """
+    if not src_dir.exists():
+        return
+    stack = [str(src_dir)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if recursive:
+                        stack.append(entry.path)
+                elif entry.name.endswith(".docx") and not entry.name.startswith("~$"):
+                    yield Path(entry.path)
+
+
 def ensure_dirs(*paths: Path):
     for p in paths:
         p.mkdir(parents=True, exist_ok=True)
 
 
-def resolve_collision(dst_path: Path, on_exists: str) -> Path:
-    if not dst_path.exists():
-        return dst_path
+def reserve_path(path: Path) -> bool:
+    """
+    Crée path (fichier vide) avec O_EXCL : test d'existence et création en un seul appel système.
+    True si l'appelant a obtenu le nom, False s'il existait déjà (ou venait d'être pris par un autre worker).
+    """
+    try:
+        os.close(os.open(path, os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0), 0o666))
+        return True
+    except FileExistsError:
+        return False
+
+
+def reserve_output(dst_path: Path, on_exists: str, ts: str = None) -> Tuple[Optional[Path], bool]:
+    """
+    Choisit la sortie selon on_exists et la réserve par création exclusive, sans course entre workers
+    (homonymes de --recursive dans des sous-dossiers différents). Retourne (chemin à écrire, réservé par cet appel) ;
+    (None, False) en skip si la sortie existe déjà.
+    `ts` : horodatage du suffixe, calculé une fois par lancement par l'appelant (défaut : maintenant).
+    Suffixe déjà pris (même seconde) -> <stem>_<ts>_<n><ext>, n = 1, 2...
+    """
+    if reserve_path(dst_path):
+        return dst_path, True
     if on_exists == "skip":
-        return dst_path  # l'appelant testera l'existence et skippera
+        return None, False
     if on_exists == "overwrite":
-        return dst_path
+        return dst_path, False
     if on_exists == "suffix":
         stem, ext = dst_path.stem, dst_path.suffix
-        ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-        return dst_path.with_name(f"{stem}_{ts}{ext}")
+        if ts is None:
+            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+        candidate = dst_path.with_name(f"{stem}_{ts}{ext}")
+        n = 0
+        while not reserve_path(candidate):
+            n += 1
+            candidate = dst_path.with_name(f"{stem}_{ts}_{n}{ext}")
+        return candidate, True
     raise ValueError(f"on_exists invalide: {on_exists}")
 
 
+def write_replace(dst_path: Path, text: str):
+    """
+    Écrit text dans un fichier temporaire du dossier de dst_path puis le renomme dessus (os.replace, atomique).
+    Le temporaire (créé en 0600 par mkstemp) reprend les permissions de dst_path, comme une réécriture
+    par open(..., "w") ; 0666 moins l'umask si dst_path a disparu entre-temps.
+    """
+    fd, tmp = tempfile.mkstemp(prefix=f".{dst_path.name}.", suffix=".tmp", dir=dst_path.parent)
+    try:
+        with open(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        try:
+            mode = stat.S_IMODE(os.stat(dst_path).st_mode)
+        except FileNotFoundError:
+            umask = os.umask(0)
+            os.umask(umask)
+            mode = 0o666 & ~umask
+        os.chmod(tmp, mode)
+        os.replace(tmp, dst_path)
+    except BaseException:
+        if os.path.lexists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+# -------------------------
+# Lecture directe du DOCX (lxml)
+# -------------------------
+# word/document.xml lu en streaming (iterparse) ; styles, relations et types de contenu lus une fois.
+# Mêmes règles que python-docx : paragraphes/tables de 1er niveau du corps, runs enfants directs
+# du paragraphe, style de paragraphe résolu par son id (style par défaut sinon).
+W_NS = "http://schemas.openxmlformats.org/wordprocessingml/2006/main"
+PKG_REL_NS = "http://schemas.openxmlformats.org/package/2006/relationships"
+CT_NS = "http://schemas.openxmlformats.org/package/2006/content-types"
+RT_STYLES = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/styles"
+
+DOCUMENT_PART = "word/document.xml"
+DOCUMENT_RELS_PART = "word/_rels/document.xml.rels"
+CONTENT_TYPES_PART = "[Content_Types].xml"
+
+
+def qn(tag: str) -> str:
+    """'w:p' -> '{namespace}p' (équivalent de docx.oxml.ns.qn, limité au namespace w)."""
+    return f"{{{W_NS}}}{tag.split(':', 1)[1]}"
+
+
+W_BODY = qn("w:body")
+W_P = qn("w:p")
+W_TBL = qn("w:tbl")
+W_TR = qn("w:tr")
+W_TC = qn("w:tc")
+W_R = qn("w:r")
+W_T = qn("w:t")
+W_TAB = qn("w:tab")
+W_PTAB = qn("w:ptab")
+W_BR = qn("w:br")
+W_CR = qn("w:cr")
+W_NO_BREAK_HYPHEN = qn("w:noBreakHyphen")
+W_RPR = qn("w:rPr")
+W_B = qn("w:b")
+W_I = qn("w:i")
+W_PPR = qn("w:pPr")
+W_PSTYLE = qn("w:pStyle")
+W_TRPR = qn("w:trPr")
+W_GRID_BEFORE = qn("w:gridBefore")
+W_TCPR = qn("w:tcPr")
+W_GRID_SPAN = qn("w:gridSpan")
+W_VMERGE = qn("w:vMerge")
+W_STYLE = qn("w:style")
+W_NAME = qn("w:name")
+W_VAL = qn("w:val")
+W_TYPE = qn("w:type")
+W_STYLE_ID = qn("w:styleId")
+W_DEFAULT = qn("w:default")
+
+# Texte des éléments de contenu d'un run (comme Run.text de python-docx)
+RUN_CONTENT_TEXT = {W_TAB: "\t", W_PTAB: "\t", W_CR: "\n", W_NO_BREAK_HYPHEN: "-"}
+
+
+def on_off(value, default: bool) -> bool:
+    """Valeur ST_OnOff (w:b, w:default...) : attribut absent -> default."""
+    if value is None:
+        return default
+    return value in ("1", "true", "on")
+
+
+def read_part_rels(z: zipfile.ZipFile) -> list:
+    """Relations internes de document.xml : [(type, nom de la part dans le ZIP)]."""
+    try:
+        rels = etree.fromstring(z.read(DOCUMENT_RELS_PART))
+    except KeyError:
+        return []
+    parts = []
+    for rel in rels.iter(f"{{{PKG_REL_NS}}}Relationship"):
+        if rel.get("TargetMode") == "External":
+            continue
+        target = rel.get("Target") or ""
+        if target.startswith("/"):
+            name = target.lstrip("/")
+        else:
+            name = posixpath.normpath(posixpath.join("word", target))
+        parts.append((rel.get("Type") or "", name))
+    return parts
+
+
+def read_paragraph_styles(z: zipfile.ZipFile, rels: list) -> dict:
+    """
+    styleId -> nom du style de paragraphe en minuscules ; clé None -> style de paragraphe par défaut.
+    (1er w:style portant l'id, retenu seulement s'il est de type paragraphe ; défaut = dernier w:default)
+    """
+    styles = {None: ""}
+    part = next((name for rel_type, name in rels if rel_type == RT_STYLES), None)
+    if part is None or part not in z.NameToInfo:
+        return styles
+    seen = set()
+    for style in etree.fromstring(z.read(part)).iterchildren(W_STYLE):
+        name_el = style.find(W_NAME)
+        name = ((name_el.get(W_VAL) if name_el is not None else None) or "").lower()
+        is_paragraph = style.get(W_TYPE) == "paragraph"
+        style_id = style.get(W_STYLE_ID)
+        if style_id is not None and style_id not in seen:
+            seen.add(style_id)
+            if is_paragraph:
+                styles[style_id] = name
+        if is_paragraph and on_off(style.get(W_DEFAULT), False):
+            styles[None] = name
+    return styles
+
+
+def has_image_parts(z: zipfile.ZipFile, rels: list) -> bool:
+    """Vrai si une relation interne de document.xml pointe vers une part de type image/*."""
+    if not rels:
+        return False
+    try:
+        types = etree.fromstring(z.read(CONTENT_TYPES_PART))
+    except KeyError:
+        return False
+    overrides = {}
+    defaults = {}
+    for el in types.iterchildren(f"{{{CT_NS}}}Override"):
+        overrides[(el.get("PartName") or "").lower()] = el.get("ContentType") or ""
+    for el in types.iterchildren(f"{{{CT_NS}}}Default"):
+        defaults[(el.get("Extension") or "").lower()] = el.get("ContentType") or ""
+    for _, name in rels:
+        if name not in z.NameToInfo:
+            continue
+        content_type = overrides.get("/" + name.lower())
+        if content_type is None:
+            content_type = defaults.get(posixpath.splitext(name)[1][1:].lower(), "")
+        if content_type.startswith("image/"):
+            return True
+    return False
+
+
+def paragraph_style_name(p, styles: dict) -> str:
+    """Nom (minuscules) du style du paragraphe w:p."""
+    ppr = p.find(W_PPR)
+    pstyle = ppr.find(W_PSTYLE) if ppr is not None else None
+    style_id = pstyle.get(W_VAL) if pstyle is not None else None
+    if style_id in styles:
+        return styles[style_id]
+    return styles[None]
+
+
+def run_text(r) -> str:
+    """Texte d'un w:r : w:t, tabulations, retours à la ligne (w:br de type page/colonne ignorés)."""
+    parts = []
+    for child in r:
+        tag = child.tag
+        if tag == W_T:
+            parts.append(child.text or "")
+        elif tag == W_BR:
+            if child.get(W_TYPE, "textWrapping") == "textWrapping":
+                parts.append("\n")
+        elif tag in RUN_CONTENT_TEXT:
+            parts.append(RUN_CONTENT_TEXT[tag])
+    return "".join(parts)
+
+
+def run_flag(rpr, tag: str):
+    """Mise en forme directe du run (w:b / w:i) : True/False, None si non définie."""
+    if rpr is None:
+        return None
+    el = rpr.find(tag)
+    if el is None:
+        return None
+    return on_off(el.get(W_VAL), True)
+
+
 # -------------------------
 # Helpers Markdown
 # -------------------------
-def strip_accents(s: str) -> str:
-    if s is None:
-        return ""
-    return "".join(c for c in unicodedata.normalize("NFD", s) if not unicodedata.combining(c))
+# Appliquée au nom de style déjà passé en minuscules (équivalent à re.I)
+HEADING_STYLE_REGEX = re.compile(r"heading\s*(\d+)")
 
 
-def runs_to_markdown(paragraph) -> str:
+def runs_to_markdown(paragraph, style_name: str) -> str:
     """
-    Convertit les "runs" d'un paragraphe en Markdown basique (gras/italique/code).
+    Convertit les "runs" d'un paragraphe (w:p) en Markdown basique (gras/italique/code).
     - **gras**, *italique*, `code` (si style "Code")
     - concaténation textuelle sinon
+    `style_name` : nom du style du paragraphe, en minuscules.
     """
+    # Paragraphe sans run (lignes vides d'espacement, très fréquentes) : rien à lire
+    if paragraph.find(W_R) is None:
+        return ""
+
+    # rudimentaire : si la police/format suggère du code (style nommé "Code")
+    is_code = "code" in style_name
+
+    # Texte brut (cas courant des cellules de tableaux) : aucun w:b/w:i dans le paragraphe -> pas de
+    # lecture des w:rPr run par run ; recherche faite en C par lxml (un w:b de la marque de paragraphe
+    # suffit à repasser par le chemin complet, sans effet sur le résultat)
+    if not is_code and next(paragraph.iter(W_B, W_I), None) is None:
+        return "".join(run_text(run) for run in paragraph.iterchildren(W_R)).strip()
+
     parts = []
-    for run in paragraph.runs:
-        text = run.text or ""
+    for run in paragraph.iterchildren(W_R):
+        text = run_text(run)
         if not text:
             continue
 
-        # rudimentaire : si la police/format suggère du code (style nommé "Code")
-        is_code = (paragraph.style and paragraph.style.name and "code" in paragraph.style.name.lower())
-        bold = run.bold
-        italic = run.italic
+        rpr = run.find(W_RPR)
+        bold = run_flag(rpr, W_B)
+        italic = run_flag(rpr, W_I)
 
         if is_code:
             parts.append(f"`{text}`")
@@ -100,47 +354,74 @@ def runs_to_markdown(paragraph) -> str:
     return "".join(parts).strip()
 
 
-def para_to_markdown(p) -> str:
+def para_to_markdown(p, styles: dict) -> str:
     """
-    Conversion d'un paragraphe en Markdown :
+    Conversion d'un paragraphe (w:p) en Markdown :
     - Titres : styles "Heading 1..6" -> # .. ######
     - Listes : style "List Paragraph" -> "- ..."
     - Sinon : paragraphe standard
     """
-    style_name = (p.style.name if p.style else "") or ""
-    text_md = runs_to_markdown(p)
+    style_lower = paragraph_style_name(p, styles)
+    text_md = runs_to_markdown(p, style_lower)
     if not text_md.strip():
         return ""
 
     # Titres (Heading n)
-    m = re.match(r"Heading\s*(\d+)", style_name, flags=re.I)
+    m = HEADING_STYLE_REGEX.match(style_lower)
     if m:
         level = max(1, min(6, int(m.group(1))))
         return f"{'#' * level} {text_md}"
 
     # Liste simple
-    if "list" in style_name.lower():
+    if "list" in style_lower:
         return f"- {text_md}"
 
     return text_md
 
 
-def table_to_markdown(table) -> str:
+def table_rows(table, styles: dict) -> list:
     """
-    Conversion d'un tableau docx en table Markdown simple.
-    - Première ligne utilisée comme en-tête
-    - Alignement par défaut : gauche
+    Texte Markdown des cellules de chaque w:tr, comme Row.cells de python-docx :
+    une cellule fusionnée horizontalement (gridSpan) est répétée sur chaque colonne couverte,
+    une continuation de fusion verticale (vMerge) reprend la cellule de la ligne au-dessus.
     """
     rows = []
-    for row in table.rows:
+    above = {}   # colonne de grille -> (texte, gridSpan) de la ligne précédente
+    for tr in table.iterchildren(W_TR):
+        trpr = tr.find(W_TRPR)
+        grid_before = trpr.find(W_GRID_BEFORE) if trpr is not None else None
+        offset = int(grid_before.get(W_VAL, 0)) if grid_before is not None else 0
+        current = {}
         cells = []
-        for cell in row.cells:
-            # concatène le texte de chaque paragraphe de la cellule
-            cell_text = "\n".join((runs_to_markdown(p) for p in cell.paragraphs)).strip()
-            # échappe les pipe
-            cell_text = cell_text.replace("|", r"\|")
-            cells.append(cell_text)
+        for tc in tr.iterchildren(W_TC):
+            tcpr = tc.find(W_TCPR)
+            span_el = tcpr.find(W_GRID_SPAN) if tcpr is not None else None
+            vmerge = tcpr.find(W_VMERGE) if tcpr is not None else None
+            span = int(span_el.get(W_VAL, 1)) if span_el is not None else 1
+            if vmerge is not None and vmerge.get(W_VAL, "continue") == "continue" and offset in above:
+                cell_text, cell_span = above[offset]
+            else:
+                # concatène le texte de chaque paragraphe de la cellule
+                cell_text = "\n".join(runs_to_markdown(p, paragraph_style_name(p, styles))
+                                      for p in tc.iterchildren(W_P)).strip()
+                # échappe les pipe
+                cell_text = cell_text.replace("|", r"\|")
+                cell_span = span
+            current[offset] = (cell_text, cell_span)
+            cells.extend([cell_text] * cell_span)
+            offset += span
+        above = current
         rows.append(cells)
+    return rows
+
+
+def table_to_markdown(table, styles: dict) -> str:
+    """
+    Conversion d'un tableau (w:tbl) en table Markdown simple.
+    - Première ligne utilisée comme en-tête
+    - Alignement par défaut : gauche
+    """
+    rows = table_rows(table, styles)
 
     if not rows:
         return ""
@@ -163,7 +444,6 @@ def docx_to_markdown(docx_path: Path) -> str:
     - insère des lignes vides entre blocs pour lisibilité
     - images : insère un commentaire markdown indiquant la présence
     """
-    doc = Document(str(docx_path))
     out_lines = []
 
     # En-tête optionnelle : titre avec nom de fichier
@@ -173,27 +453,42 @@ def docx_to_markdown(docx_path: Path) -> str:
 
     # Approche simple et fiable : paragraphs puis tables
     # (la majorité des documents ne nécessitent pas l'ordre intercalé strict)
-    for p in doc.paragraphs:
-        line = para_to_markdown(p)
-        if line:
-            out_lines.append(line)
+    tables_md = []
+    with zipfile.ZipFile(docx_path) as z:
+        rels = read_part_rels(z)
+        styles = read_paragraph_styles(z, rels)
+        has_tables = False
+        with z.open(DOCUMENT_PART) as f:
+            for _, child in etree.iterparse(f, events=("end",), tag=(W_P, W_TBL)):
+                parent = child.getparent()
+                if parent is None or parent.tag != W_BODY:
+                    continue
+                if child.tag == W_P:
+                    line = para_to_markdown(child, styles)
+                    if line:
+                        out_lines.append(line)
+                else:
+                    has_tables = True
+                    md_table = table_to_markdown(child, styles)
+                    if md_table:
+                        tables_md.append(md_table)
+                # Libère les éléments déjà traités (mémoire bornée)
+                child.clear()
+                while child.getprevious() is not None:
+                    del parent[0]
+
+        # Images (si présentes) : docx stocke images dans relationships ; on ajoute un rappel
+        has_images = has_image_parts(z, rels)
 
     # Tables
-    if doc.tables:
+    if has_tables:
         out_lines.append("")
         out_lines.append("> **Tableaux**")
         out_lines.append("")
-        for t in doc.tables:
-            md_table = table_to_markdown(t)
-            if md_table:
-                out_lines.append(md_table)
-                out_lines.append("")
-
-    # Images (si présentes) : docx stocke images dans relationships ; on ajoute un rappel
-    rels = getattr(doc.part, "rels", {})
-    has_images = any(
-        (getattr(r._target, "content_type", "") or "").startswith("image/") for r in rels.values()
-    )
+        for md_table in tables_md:
+            out_lines.append(md_table)
+            out_lines.append("")
+
     if has_images:
         out_lines.append("> _Ce document contient des images non extraites dans ce rendu Markdown._")
 
@@ -212,6 +507,38 @@ def docx_to_markdown(docx_path: Path) -> str:
     return "\n".join(cleaned).rstrip() + "\n"
 
 
+def convert_one(task):
+    """
+    Worker : convertit un DOCX et écrit le Markdown selon la politique de collision.
+    task = (path, out_dir, on_exists, ts)
+    Retourne (statut, chemin écrit ou visé, message d'erreur) ; statut : written | skipped | error.
+    """
+    path, out_dir, on_exists, ts = task
+    out_path = out_dir / (path.stem + ".md")
+    final_path, reserved = None, False
+    try:
+        # Collisions tranchées avant la conversion : un fichier ignoré (skip) n'est pas converti pour rien
+        # out_dir (ndc/ ou edb/) déjà créé par ensure_dirs() dans main()
+        final_path, reserved = reserve_output(out_path, on_exists, ts)
+        if final_path is None:
+            return "skipped", out_path, ""
+
+        md_text = docx_to_markdown(path)
+        if reserved:
+            with open(final_path, "w", encoding="utf-8") as f:
+                f.write(md_text)
+        else:
+            # overwrite d'une sortie existante : remplacement atomique (deux homonymes n'écrivent jamais
+            # dans le même fichier en même temps)
+            write_replace(final_path, md_text)
+        return "written", final_path, ""
+
+    except Exception as e:
+        if reserved and os.path.lexists(final_path):
+            final_path.unlink()   # réservation abandonnée : pas de Markdown vide ou partiel
+        return "error", None, f"{type(e).__name__}: {e}"
+
+
 # -------------------------
 # Programme principal
 # -------------------------
@@ -225,6 +552,8 @@ def main():
                         help="Politique en cas de collision de nom (défaut: skip)")
     parser.add_argument("--recursive", action="store_true",
                         help="Parcourt récursivement ndc/ et edb/")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help="Nombre de workers (défaut: 0 = auto)")
     args = parser.parse_args()
 
     classified_root = Path(args.classified_dir).resolve()
@@ -240,49 +569,42 @@ def main():
         print(f"[ERREUR] Répertoires source introuvables sous {classified_root} (ndc/ et edb/).", file=sys.stderr)
         sys.exit(1)
 
-    def iter_docx(src_dir: Path):
-        if not src_dir.exists():
-            return []
-        if args.recursive:
-            return list(src_dir.rglob("*.docx"))
-        return list(src_dir.glob("*.docx"))
-
-    files = [(p, "ndc") for p in iter_docx(src_ndc)] + [(p, "edb") for p in iter_docx(src_edb)]
+    # Liste complète avant conversion : tri et total nécessaires au journal [i/N] ordonné
+    files = list(chain(((p, "ndc") for p in iter_docx(src_ndc, args.recursive)),
+                       ((p, "edb") for p in iter_docx(src_edb, args.recursive))))
     print(f"[INFO] {len(files)} fichier(s) .docx détecté(s) dans {classified_root}/(ndc|edb)")
 
     converted = 0
     skipped = 0
     errors = 0
 
-    for i, (path, category) in enumerate(sorted(files, key=lambda t: str(t[0]).lower()), start=1):
-        print(f"[{i}/{len(files)}] {category.upper()} : {path.name}")
-        try:
-            md_text = docx_to_markdown(path)
-            out_dir = dst_ndc if category == "ndc" else dst_edb
-            out_path = out_dir / (path.stem + ".md")
-
-            # Collisions
-            final_path = resolve_collision(out_path, args.on_exists)
-            if out_path.exists() and args.on_exists == "skip":
-                print(f"  - Skip (existe déjà) → {out_path}")
+    files = sorted(files, key=lambda t: str(t[0]).lower())
+    # Horodatage des suffixes anti-collision : un seul par lancement
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    tasks = [(path, dst_ndc if category == "ndc" else dst_edb, args.on_exists, run_ts) for path, category in files]
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(workers, len(tasks)))
+
+    # Linux : fork -> lxml déjà importé, noms de balises qualifiés et regex compilés à l'import hérités tels quels
+    mp_context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+
+    # map() rend les résultats dans l'ordre des tâches : journal identique à un traitement séquentiel
+    with ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
+        results = executor.map(convert_one, tasks, chunksize=4)
+        for i, ((path, category), (status, written_path, error)) in enumerate(zip(files, results), start=1):
+            print(f"[{i}/{len(files)}] {category.upper()} : {path.name}")
+            if status == "skipped":
+                print(f"  - Skip (existe déjà) → {written_path}")
                 skipped += 1
-                continue
-
-            out_dir.mkdir(parents=True, exist_ok=True)
-            out_path_to_write = final_path
-
-            with open(out_path_to_write, "w", encoding="utf-8") as f:
-                f.write(md_text)
-
-            if out_path_to_write != out_path:
-                print(f"  - Écrit (suffix) → {out_path_to_write}")
+            elif status == "written":
+                if written_path.name != path.stem + ".md":
+                    print(f"  - Écrit (suffix) → {written_path}")
+                else:
+                    print(f"  - Écrit → {written_path}")
+                converted += 1
             else:
-                print(f"  - Écrit → {out_path_to_write}")
-            converted += 1
-
-        except Exception as e:
-            print(f"  ! ERREUR : {type(e).__name__}: {e}", file=sys.stderr)
-            errors += 1
+                print(f"  ! ERREUR : {error}", file=sys.stderr)
+                errors += 1
 
     print("")
     print(f"[RÉSUMÉ] Convertis: {converted} • Ignorés (skip): {skipped} • Erreurs: {errors}")
@@ -8,22 +8,27 @@ convert_to_docx.py (DOC + PDF -> DOCX) - VERSION PARALLÉLISÉE
 - Convertit tous les .doc -> .docx via LibreOffice (soffice)
 - Convertit tous les .pdf -> .docx via pdf2docx
 - Copie aussi tous les .docx déjà au bon format depuis dedupe vers docx
-- Génère un Excel de traçabilité : convert_report.xlsx
+- Génère un rapport de traçabilité écrit au fil des résultats : convert_report.csv (défaut)
+  ou convert_report.xlsx (--report-format xlsx)
 - Gestion des collisions via --on-exists {skip|overwrite|suffix}
 - Parallélisation configurable via --workers
 """
 
 import argparse
+import csv
 import subprocess
 import shutil
 import os
+import locale
+import socket
+import time
 from pathlib import Path
 from datetime import datetime
 import tempfile
-import pandas as pd
 import sys
-from concurrent.futures import ProcessPoolExecutor, as_completed
-from typing import Tuple, Optional
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import contextmanager, nullcontext
+from typing import List, Tuple, Optional
 
 # --- PDF conversion (pdf2docx) ---
 try:
@@ -32,10 +37,31 @@ try:
 except Exception:
     PDF2DOCX_AVAILABLE = False
 
+# --- DOC conversion via serveurs LibreOffice persistants (pont UNO, fourni avec le Python de LibreOffice) ---
+try:
+    import uno
+    from com.sun.star.beans import PropertyValue
+    UNO_AVAILABLE = True
+except Exception:
+    UNO_AVAILABLE = False
+
 DEFAULT_SOURCE = "dedupe"
-DEFAULT_REPORT = "convert_report.xlsx"
+DEFAULT_REPORT = "convert_report"
+DEFAULT_REPORT_FORMAT = "csv"
+REPORT_FORMATS = ("csv", "xlsx")
+REPORT_SHEET = "Conversions & Copies"
+# Les workers renvoient chaque ligne de rapport sous forme de tuple dans cet ordre de colonnes
+REPORT_COLUMNS = ["Type", "Fichier source", "Chemin source", "Action", "Message", "Fichier généré"]
 ON_EXISTS_CHOICES = {"skip", "overwrite", "suffix"}
 DEFAULT_WORKERS = 0  # 0 = auto (nombre de CPU)
+# Copies DOCX (pures E/S, le GIL est relâché pendant read/write) : threads du processus principal
+DEFAULT_COPY_THREADS = min(32, (os.cpu_count() or 1) * 4)
+# .doc convertis par lancement de soffice : le démarrage de LibreOffice (plusieurs secondes) est amorti sur le lot
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_UNO_LISTENERS = 0  # 0 = pas de serveur persistant (un lancement de soffice par lot)
+UNO_HOST = "127.0.0.1"
+UNO_BASE_PORT = 2202
+UNO_START_TIMEOUT = 60  # secondes d'attente du démarrage d'un serveur soffice
 
 
 def find_soffice(user_path: Optional[str]) -> Optional[Path]:
@@ -47,89 +73,280 @@ def find_soffice(user_path: Optional[str]) -> Optional[Path]:
     return Path(which) if which else None
 
 
-def run_soffice_convert(soffice: Path, src_doc: Path, out_dir: Path) -> Tuple[bool, str]:
+def worker_profile_dir(profiles_root: Optional[str]) -> Optional[Path]:
+    """
+    Profil LibreOffice du worker courant : <profiles_root>/profile_<pid>.
+    Un worker n'exécute qu'un soffice à la fois, le profil est donc réutilisé d'une conversion
+    à l'autre sans conflit avec les autres workers ; seule la 1re conversion paie son initialisation.
+    """
+    if not profiles_root:
+        return None
+    return Path(profiles_root) / f"profile_{os.getpid()}"
+
+
+def run_soffice_convert_batch(soffice: Path, src_docs: List[Path], out_dir: Path,
+                              profile_dir: Optional[Path] = None) -> Tuple[List[bool], str]:
     """
-    Exécute LibreOffice pour convertir src_doc -> .docx dans out_dir.
-    Utilise un profil utilisateur temporaire pour permettre le parallélisme.
-    Retourne (success, output_text).
+    Exécute LibreOffice une seule fois pour convertir tous les src_docs -> .docx dans out_dir
+    (démarrage de soffice amorti sur le lot). Les noms de sortie (stem + .docx) doivent être distincts.
+    Utilise le profil utilisateur profile_dir (propre au worker, voir worker_profile_dir),
+    ou à défaut un profil temporaire, pour permettre le parallélisme.
+    Retourne (succès par fichier, output_text) ; la sortie de soffice n'est décodée qu'en cas d'échec
+    (message du rapport), sans les lignes "convert ..." des fichiers du lot qui ont réussi.
     """
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    # Créer un profil temporaire unique pour cette instance
-    with tempfile.TemporaryDirectory() as user_profile:
+    # Sans profil de worker : profil temporaire unique pour cette instance
+    with tempfile.TemporaryDirectory() if profile_dir is None else nullcontext(str(profile_dir)) as user_profile:
         cmd = [
             str(soffice),
             f"-env:UserInstallation=file://{user_profile}",
             "--headless", "--nologo", "--nodefault", "--invisible",
             "--convert-to", "docx",
             "--outdir", str(out_dir),
-            str(src_doc),
-        ]
-        proc = subprocess.run(
-            cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True
-        )
-        output = (proc.stdout or "").strip()
+        ] + [str(src_doc) for src_doc in src_docs]
+        proc = subprocess.run(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+    oks = [(out_dir / (src_doc.stem + ".docx")).exists() for src_doc in src_docs]
+    if all(oks):
+        return oks, ""
+    output = proc.stdout.decode(locale.getpreferredencoding(False), errors="replace")
+    return oks, "\n".join(line for line in output.strip().splitlines() if not line.startswith("convert ")).strip()
+
+
+def start_uno_listeners(soffice: Path, count: int, profiles_root: str) -> Tuple[List[subprocess.Popen], List[int]]:
+    """
+    Lance count serveurs soffice en écoute UNO (ports UNO_BASE_PORT, UNO_BASE_PORT + 1...), chacun avec
+    son profil <profiles_root>/listener_<port>, et attend qu'ils acceptent les connexions.
+    Le démarrage de LibreOffice n'est payé qu'une fois par serveur pour tout le lancement.
+    Lève RuntimeError (après arrêt des serveurs lancés) si l'un d'eux ne répond pas à temps.
+    """
+    procs, ports = [], []
+    for i in range(count):
+        port = UNO_BASE_PORT + i
+        profile_dir = Path(profiles_root) / f"listener_{port}"
+        procs.append(subprocess.Popen([
+            str(soffice),
+            f"-env:UserInstallation=file://{profile_dir}",
+            "--headless", "--nologo", "--nodefault", "--invisible", "--norestore",
+            f"--accept=socket,host={UNO_HOST},port={port};urp;StarOffice.ComponentContext",
+        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL))
+        ports.append(port)
+
+    deadline = time.monotonic() + UNO_START_TIMEOUT
+    for proc, port in zip(procs, ports):
+        while True:
+            try:
+                socket.create_connection((UNO_HOST, port), timeout=1).close()
+                break
+            except OSError:
+                if proc.poll() is not None or time.monotonic() > deadline:
+                    stop_uno_listeners(procs)
+                    raise RuntimeError(f"serveur soffice injoignable sur le port {port}")
+                time.sleep(0.2)
+    return procs, ports
+
+
+def stop_uno_listeners(procs: List[subprocess.Popen]) -> None:
+    """Arrête les serveurs soffice lancés par start_uno_listeners."""
+    for proc in procs:
+        if proc.poll() is None:
+            proc.terminate()
+    for proc in procs:
+        try:
+            proc.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            proc.kill()
+            proc.wait()
+
+
+@contextmanager
+def uno_listeners(soffice: Path, count: int, profiles_root: str):
+    """
+    Serveurs soffice persistants pendant le bloc with ; fournit la liste de leurs ports,
+    vide (repli sur un lancement de soffice par lot) si count vaut 0, si le pont UNO est absent
+    ou si un serveur ne démarre pas.
+    """
+    procs, ports = [], []
+    if count > 0:
+        if not UNO_AVAILABLE:
+            print("⚠️  Module 'uno' indisponible (Python de LibreOffice requis) : un lancement de soffice par lot")
+        else:
+            try:
+                procs, ports = start_uno_listeners(soffice, count, profiles_root)
+            except RuntimeError as e:
+                print(f"⚠️  {e} : un lancement de soffice par lot")
+    try:
+        yield ports
+    finally:
+        stop_uno_listeners(procs)
+
 
-    produced = out_dir / (src_doc.stem + ".docx")
-    return produced.exists(), output
+def uno_property(name: str, value) -> "PropertyValue":
+    prop = PropertyValue()
+    prop.Name = name
+    prop.Value = value
+    return prop
+
+
+def run_uno_convert_batch(port: int, src_docs: List[Path], out_dir: Path) -> Tuple[List[bool], str]:
+    """
+    Convertit src_docs -> .docx dans out_dir via le serveur soffice persistant du port donné
+    (loadComponentFromURL puis storeToURL avec le filtre "MS Word 2007 XML", comme --convert-to docx).
+    Même contrat que run_soffice_convert_batch : (succès par fichier, messages d'erreur).
+    """
+    out_dir.mkdir(parents=True, exist_ok=True)
+    try:
+        local_ctx = uno.getComponentContext()
+        resolver = local_ctx.ServiceManager.createInstanceWithContext("com.sun.star.bridge.UnoUrlResolver", local_ctx)
+        ctx = resolver.resolve(f"uno:socket,host={UNO_HOST},port={port};urp;StarOffice.ComponentContext")
+        desktop = ctx.ServiceManager.createInstanceWithContext("com.sun.star.frame.Desktop", ctx)
+    except Exception as e:
+        return [False] * len(src_docs), f"connexion UNO (port {port}) impossible ({e.__class__.__name__}: {e})"
+
+    load_props = (uno_property("Hidden", True),)
+    store_props = (uno_property("FilterName", "MS Word 2007 XML"), uno_property("Overwrite", True))
+    oks, errors = [], []
+    for src_doc in src_docs:
+        produced = out_dir / (src_doc.stem + ".docx")
+        try:
+            document = desktop.loadComponentFromURL(uno.systemPathToFileUrl(str(src_doc.resolve())), "_blank", 0, load_props)
+            if document is None:
+                raise RuntimeError("document illisible")
+            try:
+                document.storeToURL(uno.systemPathToFileUrl(str(produced.resolve())), store_props)
+            finally:
+                document.close(True)
+        except Exception as e:
+            errors.append(f"{src_doc.name}: {e.__class__.__name__}: {e}")
+        oks.append(produced.exists())
+    return oks, "\n".join(errors)
 
 
 # ------------------------------
 # Fonctions de traitement unitaire (pour parallélisation)
 # ------------------------------
 
-def process_doc(args: Tuple) -> dict:
-    """Traite un fichier .doc -> .docx"""
-    doc_path, dest_dir, soffice_path, on_exists = args
-    doc_path = Path(doc_path)
+def reserve_suffixed(expected: Path, run_ts: str) -> Path:
+    """
+    Réserve le nom anti-collision de expected : <stem>_<run_ts><ext>, puis <stem>_<run_ts>_<n><ext>
+    avec n = 1, 2... (run_ts calculé une fois par lancement). La réservation crée un fichier vide avec O_EXCL :
+    test d'existence et création en un seul appel système, sans course entre workers ; la sortie le remplace ensuite.
+    """
+    flags = os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0)
+    stem, suffix = expected.stem, expected.suffix
+    candidate = expected.with_name(f"{stem}_{run_ts}{suffix}")
+    n = 0
+    while True:
+        try:
+            os.close(os.open(candidate, flags, 0o666))
+            return candidate
+        except FileExistsError:
+            n += 1
+            candidate = expected.with_name(f"{stem}_{run_ts}_{n}{suffix}")
+
+
+def doc_row(doc_path: Path, action: str, message: str, out_path: str) -> Tuple[str, ...]:
+    """Ligne de rapport d'un fichier .doc"""
+    return ("DOC->DOCX", doc_path.name, str(doc_path), action, message, out_path)
+
+
+def process_doc_batch(args: Tuple) -> List[Tuple[str, ...]]:
+    """
+    Traite un lot de fichiers .doc -> .docx : un appel soffice pour les sorties directes dans dest_dir
+    (nouveaux fichiers et overwrite), un autre vers un dossier temporaire pour les collisions en mode suffix.
+    Deux .doc du lot au même nom de sortie (ex. a.doc et a.DOC) ne sont jamais convertis par le même appel :
+    le second passe au tour suivant et voit alors la sortie du premier, comme en traitement unitaire.
+    Avec uno_port, les conversions passent par le serveur soffice persistant de ce port (voir start_uno_listeners).
+    Retourne une ligne de rapport par fichier, dans l'ordre du lot.
+    """
+    doc_paths, dest_dir, soffice_path, on_exists, run_ts, profiles_root, uno_port = args
+    doc_paths = [Path(p) for p in doc_paths]
     dest_dir = Path(dest_dir)
     soffice_path = Path(soffice_path)
+    profile_dir = worker_profile_dir(profiles_root)
+
+    def convert_batch(src_docs: List[Path], out_dir: Path) -> Tuple[List[bool], str]:
+        if uno_port is not None:
+            return run_uno_convert_batch(uno_port, src_docs, out_dir)
+        return run_soffice_convert_batch(soffice_path, src_docs, out_dir, profile_dir)
+
+    rows = {}
+    pending = doc_paths
+    while pending:
+        current, deferred, stems = [], [], set()
+        for doc_path in pending:
+            (deferred if doc_path.stem in stems else current).append(doc_path)
+            stems.add(doc_path.stem)
+        pending = deferred
+
+        direct = []     # (doc, action, message) convertis directement dans dest_dir
+        suffixed = []   # collisions en mode suffix : conversion en dossier temporaire puis renommage
+        for doc_path in current:
+            expected = dest_dir / (doc_path.stem + ".docx")
+            if not expected.exists():
+                direct.append((doc_path, "converti", "OK"))
+            elif on_exists == "skip":
+                rows[doc_path] = doc_row(doc_path, "ignoré", "existe déjà (skip)", "")
+            elif on_exists == "overwrite":
+                direct.append((doc_path, "converti (écrasé)", "overwrite"))
+            elif on_exists == "suffix":
+                suffixed.append(doc_path)
 
-    expected = dest_dir / (doc_path.stem + ".docx")
-    action = ""
-    message = ""
-    out_path = ""
+        if direct:
+            oks, out = convert_batch([d[0] for d in direct], dest_dir)
+            for (doc_path, action, message), ok in zip(direct, oks):
+                if ok:
+                    rows[doc_path] = doc_row(doc_path, action, message, str(dest_dir / (doc_path.stem + ".docx")))
+                else:
+                    rows[doc_path] = doc_row(doc_path, "échec", f"conversion échouée | {out}", "")
 
-    if expected.exists():
-        if on_exists == "skip":
-            action, message = "ignoré", "existe déjà (skip)"
-        elif on_exists == "overwrite":
-            ok, out = run_soffice_convert(soffice_path, doc_path, dest_dir)
-            if ok:
-                action, message, out_path = "converti (écrasé)", "overwrite", str(expected)
-            else:
-                action, message = "échec", f"conversion échouée | {out}"
-        elif on_exists == "suffix":
+        if suffixed:
             with tempfile.TemporaryDirectory() as tmpdir:
                 tmp_out = Path(tmpdir)
-                ok, out = run_soffice_convert(soffice_path, doc_path, tmp_out)
-                if ok:
-                    ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    final = expected.with_name(f"{expected.stem}_{ts}{expected.suffix}")
-                    (tmp_out / expected.name).replace(final)
-                    action, message, out_path = "converti (suffixé)", "collision évitée", str(final)
-                else:
-                    action, message = "échec", f"conversion échouée | {out}"
-    else:
-        ok, out = run_soffice_convert(soffice_path, doc_path, dest_dir)
-        if ok:
-            action, message, out_path = "converti", "OK", str(expected)
-        else:
-            action, message = "échec", f"conversion échouée | {out}"
-
-    return {
-        "Type": "DOC->DOCX",
-        "Fichier source": doc_path.name,
-        "Chemin source": str(doc_path),
-        "Action": action,
-        "Message": message,
-        "Fichier généré": out_path,
-    }
+                oks, out = convert_batch(suffixed, tmp_out)
+                for doc_path, ok in zip(suffixed, oks):
+                    if ok:
+                        expected = dest_dir / (doc_path.stem + ".docx")
+                        final = reserve_suffixed(expected, run_ts)
+                        (tmp_out / expected.name).replace(final)
+                        rows[doc_path] = doc_row(doc_path, "converti (suffixé)", "collision évitée", str(final))
+                    else:
+                        rows[doc_path] = doc_row(doc_path, "échec", f"conversion échouée | {out}", "")
+
+    return [rows.get(doc_path) or doc_row(doc_path, "", "", "") for doc_path in doc_paths]
+
+
+def init_worker() -> None:
+    """
+    Initialiseur des workers du pool : charge une fois par processus les ressources de PyMuPDF
+    (utilisé par pdf2docx), pour que seul le 1er PDF d'un worker paie leur initialisation.
+    """
+    if not PDF2DOCX_AVAILABLE:
+        return
+    try:
+        import fitz
+        fitz.open().close()
+        fitz.TOOLS.mupdf_warnings()
+    except Exception:
+        pass
+
+
+def convert_pdf(pdf_path: Path, out_path: str) -> None:
+    """
+    Conversion pdf2docx d'un PDF vers out_path, sans le multiprocessing interne de pdf2docx :
+    le pool occupe déjà tous les CPU, des processus supplémentaires ne feraient que se les disputer.
+    """
+    cv = PdfConverter(str(pdf_path))
+    try:
+        cv.convert(out_path, start=0, end=None, multi_processing=False, cpu_count=1)
+    finally:
+        cv.close()
 
 
-def process_pdf(args: Tuple) -> dict:
+def process_pdf(args: Tuple) -> Tuple[str, ...]:
     """Traite un fichier .pdf -> .docx"""
-    pdf_path, dest_dir, on_exists = args
+    pdf_path, dest_dir, on_exists, run_ts = args
     pdf_path = Path(pdf_path)
     dest_dir = Path(dest_dir)
 
@@ -139,14 +356,7 @@ def process_pdf(args: Tuple) -> dict:
     out_path = ""
 
     if not PDF2DOCX_AVAILABLE:
-        return {
-            "Type": "PDF->DOCX",
-            "Fichier source": pdf_path.name,
-            "Chemin source": str(pdf_path),
-            "Action": "échec",
-            "Message": "pdf2docx non disponible",
-            "Fichier généré": "",
-        }
+        return ("PDF->DOCX", pdf_path.name, str(pdf_path), "échec", "pdf2docx non disponible", "")
 
     try:
         if expected.exists():
@@ -157,27 +367,26 @@ def process_pdf(args: Tuple) -> dict:
                     expected.unlink()
                 except Exception:
                     pass
-                cv = PdfConverter(str(pdf_path))
-                cv.convert(str(expected), start=0, end=None)
-                cv.close()
+                convert_pdf(pdf_path, str(expected))
                 if expected.exists():
                     action, message, out_path = "converti", "converti (écrasé)", str(expected)
                 else:
                     action, message = "échec", "échec conversion (sortie manquante)"
             elif on_exists == "suffix":
-                ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-                final_path = expected.with_name(f"{expected.stem}_{ts}{expected.suffix}")
-                cv = PdfConverter(str(pdf_path))
-                cv.convert(str(final_path), start=0, end=None)
-                cv.close()
-                if final_path.exists():
+                final_path = reserve_suffixed(expected, run_ts)
+                try:
+                    convert_pdf(pdf_path, str(final_path))
+                except Exception:
+                    final_path.unlink(missing_ok=True)
+                    raise
+                # Réservation encore vide : pdf2docx n'a rien écrit
+                if final_path.stat().st_size > 0:
                     action, message, out_path = "converti", "converti (suffixé)", str(final_path)
                 else:
+                    final_path.unlink(missing_ok=True)
                     action, message = "échec", "échec conversion (sortie manquante)"
         else:
-            cv = PdfConverter(str(pdf_path))
-            cv.convert(str(expected), start=0, end=None)
-            cv.close()
+            convert_pdf(pdf_path, str(expected))
             if expected.exists():
                 action, message, out_path = "converti", "converti", str(expected)
             else:
@@ -186,19 +395,15 @@ def process_pdf(args: Tuple) -> dict:
     except Exception as e:
         action, message = "échec", f"échec conversion PDF ({e.__class__.__name__}: {e})"
 
-    return {
-        "Type": "PDF->DOCX",
-        "Fichier source": pdf_path.name,
-        "Chemin source": str(pdf_path),
-        "Action": action,
-        "Message": message,
-        "Fichier généré": out_path,
-    }
+    return ("PDF->DOCX", pdf_path.name, str(pdf_path), action, message, out_path)
 
 
-def process_copy(args: Tuple) -> dict:
-    """Copie un fichier .docx"""
-    src_docx, dest_dir, on_exists = args
+def process_copy(args: Tuple) -> Tuple[str, ...]:
+    """
+    Copie un fichier .docx (contenu seul, via shutil.copyfile : copie noyau sendfile sous Linux).
+    Dates et permissions ne sont pas recopiées (pas de copystat), comme pour les .docx issus de conversion.
+    """
+    src_docx, dest_dir, on_exists, run_ts = args
     src_docx = Path(src_docx)
     dest_dir = Path(dest_dir)
 
@@ -213,25 +418,61 @@ def process_copy(args: Tuple) -> dict:
         if on_exists == "skip":
             action, msg = "copié", "ignoré (existe déjà)"
         elif on_exists == "overwrite":
-            shutil.copy2(src_docx, expected)
+            shutil.copyfile(src_docx, expected)
             action, msg, out_path = "copié", "copié (écrasé)", str(expected)
         elif on_exists == "suffix":
-            ts = datetime.now().strftime("%Y%m%d_%H%M%S")
-            final = expected.with_name(f"{expected.stem}_{ts}{expected.suffix}")
-            shutil.copy2(src_docx, final)
+            final = reserve_suffixed(expected, run_ts)
+            try:
+                shutil.copyfile(src_docx, final)
+            except Exception:
+                final.unlink(missing_ok=True)
+                raise
             action, msg, out_path = "copié", "copié (suffixé)", str(final)
     else:
-        shutil.copy2(src_docx, expected)
+        shutil.copyfile(src_docx, expected)
         action, msg, out_path = "copié", "copié", str(expected)
 
-    return {
-        "Type": "COPIE DOCX",
-        "Fichier source": src_docx.name,
-        "Chemin source": str(src_docx),
-        "Action": action,
-        "Message": msg,
-        "Fichier généré": out_path,
-    }
+    return ("COPIE DOCX", src_docx.name, str(src_docx), action, msg, out_path)
+
+
+class ReportWriter:
+    """
+    Rapport écrit ligne à ligne pendant le traitement (mémoire constante, rapport partiel si interruption) :
+      - csv : UTF-8 avec BOM (ouverture directe dans Excel), lisible pendant le traitement
+      - xlsx : openpyxl write-only (lignes sérialisées au fil de l'eau), enregistré à la fermeture
+    """
+    def __init__(self, report_path: Path, report_format: str):
+        self.report_path = report_path
+        self.report_format = report_format
+        if report_format == "xlsx":
+            from openpyxl import Workbook  # uniquement requis pour --report-format xlsx
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet(REPORT_SHEET)
+            self._ws.append(REPORT_COLUMNS)
+        else:
+            self._file = open(report_path, "w", newline="", encoding="utf-8-sig")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(REPORT_COLUMNS)
+
+    def write(self, row: Tuple[str, ...]):
+        if self.report_format == "xlsx":
+            self._ws.append(row)
+        else:
+            self._csv.writerow(row)
+            self._file.flush()
+
+    def close(self):
+        if self.report_format == "xlsx":
+            self._wb.save(self.report_path)
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
 
 
 def main():
@@ -247,10 +488,32 @@ def main():
     parser.add_argument("--on-exists", type=str, default="skip", choices=sorted(ON_EXISTS_CHOICES),
                         help="Collision policy: skip | overwrite | suffix (défaut: skip)")
     parser.add_argument("--report", type=str, default=DEFAULT_REPORT,
-                        help="Nom du fichier Excel de rapport (défaut: convert_report.xlsx)")
+                        help="Fichier de rapport ; une extension .csv/.xlsx fixe le format, sinon celle de "
+                             "--report-format est ajoutée (défaut: convert_report)")
+    parser.add_argument("--report-format", choices=list(REPORT_FORMATS), default=None,
+                        help=f"Format du rapport (défaut: extension de --report, sinon {DEFAULT_REPORT_FORMAT})")
     parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
                         help="Nombre de workers (défaut: 0 = auto)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE,
+                        help=f"Nombre max de .doc convertis par appel à soffice (défaut: {DEFAULT_BATCH_SIZE})")
+    parser.add_argument("--uno-listeners", type=int, default=DEFAULT_UNO_LISTENERS,
+                        help="Nombre de serveurs soffice persistants (pont UNO, ports 2202, 2203...) partagés "
+                             "par les workers pour les DOC (défaut: 0 = un lancement de soffice par lot)")
     args = parser.parse_args()
+    if args.batch_size <= 0:
+        parser.error("--batch-size doit être > 0")
+    if args.uno_listeners < 0:
+        parser.error("--uno-listeners doit être >= 0")
+    # Rapport : le chemin donné n'est jamais réécrit (--report mon_rapport.xlsx -> Excel)
+    report_ext = Path(args.report).suffix.lower()[1:]
+    if report_ext in REPORT_FORMATS:
+        if args.report_format and args.report_format != report_ext:
+            parser.error(f"--report {args.report} incompatible avec --report-format {args.report_format}")
+        report_format = report_ext
+        report_path = Path(args.report).resolve()
+    else:
+        report_format = args.report_format or DEFAULT_REPORT_FORMAT
+        report_path = Path(f"{args.report}.{report_format}").resolve()
 
     source_dir = Path(args.source).resolve()
     if not source_dir.exists() or not source_dir.is_dir():
@@ -267,9 +530,23 @@ def main():
         sys.exit(1)
 
     # Collecte
-    docs = sorted([p for p in source_dir.iterdir() if p.is_file() and p.suffix.lower() == ".doc"])
-    pdfs = sorted([p for p in source_dir.iterdir() if p.is_file() and p.suffix.lower() == ".pdf"])
-    docxs = sorted([p for p in source_dir.iterdir() if p.is_file() and p.suffix.lower() == ".docx"])
+    # Un seul parcours os.scandir, extension testée avant le type : seules les entrées .doc/.pdf/.docx
+    # passent par DirEntry.is_file() (type lu par readdir, stat seulement si le système de fichiers ne le fournit pas)
+    docs, pdfs, docxs = [], [], []
+    by_ext = {".doc": docs, ".pdf": pdfs, ".docx": docxs}
+    with os.scandir(source_dir) as it:
+        for entry in it:
+            name = entry.name
+            # Extension comme Path.suffix (".doc" seul -> pas d'extension) sans objet Path
+            dot = name.rfind(".")
+            if not 0 < dot < len(name) - 1:
+                continue
+            files = by_ext.get(name[dot:].lower())
+            if files is not None and entry.is_file():
+                files.append(entry.path)   # chemins gardés en str jusqu'aux tâches du pool
+    docs.sort()
+    pdfs.sort()
+    docxs.sort()
 
     workers = args.workers if args.workers > 0 else os.cpu_count()
     total = len(docs) + len(pdfs) + len(docxs)
@@ -282,74 +559,118 @@ def main():
     print(f"    - Collision: {args.on_exists}")
     print(f"    - Fichiers: {len(docs)} DOC, {len(pdfs)} PDF, {len(docxs)} DOCX\n")
 
-    rows = []
     stats = {
         "doc_ok": 0, "doc_skip": 0, "doc_fail": 0,
         "pdf_ok": 0, "pdf_skip": 0, "pdf_fail": 0,
         "copy_ok": 0, "copy_skip": 0,
     }
 
-    # Préparer les tâches
-    doc_tasks = [(str(p), str(dest_dir), str(soffice_path), args.on_exists) for p in docs]
-    pdf_tasks = [(str(p), str(dest_dir), args.on_exists) for p in pdfs]
-    copy_tasks = [(str(p), str(dest_dir), args.on_exists) for p in docxs]
-
     completed = 0
 
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    def record(task_type: str, result: Tuple[str, ...]) -> None:
+        """Écrit la ligne de rapport, met à jour les stats et affiche la progression."""
+        nonlocal completed
+        completed += 1
+        report.write(result)
+
+        # Mise à jour des stats
+        _, source_name, _, action, message, _ = result
+        if task_type == "DOC":
+            if "ignoré" in action:
+                stats["doc_skip"] += 1
+            elif "échec" in action:
+                stats["doc_fail"] += 1
+            else:
+                stats["doc_ok"] += 1
+        elif task_type == "PDF":
+            if "ignoré" in action:
+                stats["pdf_skip"] += 1
+            elif "échec" in action:
+                stats["pdf_fail"] += 1
+            else:
+                stats["pdf_ok"] += 1
+        else:  # COPY
+            if "ignoré" in message:
+                stats["copy_skip"] += 1
+            else:
+                stats["copy_ok"] += 1
+
+        # Affichage progression
+        print(f"[{completed}/{total}] [{task_type:4}] {source_name}: {action}")
+
+    # En mode skip, les fichiers dont la sortie existe déjà sont tranchés ici : ni pickle ni aller-retour vers le pool
+    skipped = []   # (type de tâche, ligne de rapport)
+    todo_docs, todo_pdfs, todo_docxs = docs, pdfs, docxs
+    if args.on_exists == "skip":
+        def without_existing(paths, task_type, out_name, skip_row):
+            todo = []
+            for p in paths:
+                if os.path.exists(os.path.join(dest_dir, out_name(os.path.basename(p)))):
+                    skipped.append((task_type, skip_row(p)))
+                else:
+                    todo.append(p)
+            return todo
+
+        todo_docs = without_existing(docs, "DOC", lambda name: os.path.splitext(name)[0] + ".docx",
+                                     lambda p: doc_row(Path(p), "ignoré", "existe déjà (skip)", ""))
+        # Sans pdf2docx, chaque PDF reste signalé en échec par process_pdf
+        if PDF2DOCX_AVAILABLE:
+            todo_pdfs = without_existing(pdfs, "PDF", lambda name: os.path.splitext(name)[0] + ".docx",
+                                         lambda p: ("PDF->DOCX", os.path.basename(p), p,
+                                                    "ignoré", "existe déjà (skip)", ""))
+        todo_docxs = without_existing(docxs, "COPY", lambda name: name,
+                                      lambda p: ("COPIE DOCX", os.path.basename(p), p,
+                                                 "copié", "ignoré (existe déjà)", ""))
+
+    # Préparer les tâches
+    # Horodatage anti-collision (--on-exists suffix) calculé une fois pour tout le lancement
+    run_ts = datetime.now().strftime("%Y%m%d_%H%M%S")
+    dest_str = str(dest_dir)
+    pdf_tasks = [(p, dest_str, args.on_exists, run_ts) for p in todo_pdfs]
+    copy_tasks = [(p, dest_str, args.on_exists, run_ts) for p in todo_docxs]
+
+    # Profils LibreOffice des workers (un par processus, voir worker_profile_dir) et des serveurs UNO
+    # éventuels : serveurs arrêtés puis profils supprimés après l'arrêt du pool (sortie des with dans l'ordre inverse)
+    with ReportWriter(report_path, report_format) as report, \
+            tempfile.TemporaryDirectory(prefix="lo_profiles_") as profiles_root, \
+            uno_listeners(soffice_path, args.uno_listeners if todo_docs else 0, profiles_root) as uno_ports, \
+            ProcessPoolExecutor(max_workers=workers, initializer=init_worker) as executor, \
+            ThreadPoolExecutor(max_workers=max(1, min(DEFAULT_COPY_THREADS, len(copy_tasks)))) as copy_executor:
+        # Lots de .doc, réduits si besoin pour que chaque worker ait au moins un lot
+        batch_size = max(1, min(args.batch_size, -(-len(todo_docs) // workers)))
+        # Avec des serveurs UNO, les lots leur sont répartis à tour de rôle
+        doc_tasks = [(todo_docs[i:i + batch_size], dest_str, str(soffice_path),
+                      args.on_exists, run_ts, profiles_root,
+                      uno_ports[(i // batch_size) % len(uno_ports)] if uno_ports else None)
+                     for i in range(0, len(todo_docs), batch_size)]
+
         # Soumettre toutes les tâches
         futures = {}
 
         for task in doc_tasks:
-            futures[executor.submit(process_doc, task)] = "DOC"
+            futures[executor.submit(process_doc_batch, task)] = "DOC"
         for task in pdf_tasks:
             futures[executor.submit(process_pdf, task)] = "PDF"
+        # Copies soumises en dernier : les workers du pool (fork) sont déjà lancés quand les threads démarrent
         for task in copy_tasks:
-            futures[executor.submit(process_copy, task)] = "COPY"
+            futures[copy_executor.submit(process_copy, task)] = "COPY"
+
+        # Fichiers ignorés d'office, rapportés pendant que le pool travaille
+        for task_type, result in skipped:
+            record(task_type, result)
 
         # Collecter les résultats
         for future in as_completed(futures):
-            completed += 1
             task_type = futures[future]
-            result = future.result()
-            rows.append(result)
-
-            # Mise à jour des stats
-            action = result["Action"]
-            if task_type == "DOC":
-                if "ignoré" in action:
-                    stats["doc_skip"] += 1
-                elif "échec" in action:
-                    stats["doc_fail"] += 1
-                else:
-                    stats["doc_ok"] += 1
-            elif task_type == "PDF":
-                if "ignoré" in action:
-                    stats["pdf_skip"] += 1
-                elif "échec" in action:
-                    stats["pdf_fail"] += 1
-                else:
-                    stats["pdf_ok"] += 1
-            else:  # COPY
-                if "ignoré" in result["Message"]:
-                    stats["copy_skip"] += 1
-                else:
-                    stats["copy_ok"] += 1
-
-            # Affichage progression
-            print(f"[{completed}/{total}] [{task_type:4}] {result['Fichier source']}: {result['Action']}")
-
-    # Rapport Excel
-    report_path = Path(args.report).resolve()
-    df = pd.DataFrame(rows, columns=["Type", "Fichier source", "Chemin source", "Action", "Message", "Fichier généré"])
-    with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Conversions & Copies")
+            # Un lot DOC renvoie une ligne par fichier
+            for result in (future.result() if task_type == "DOC" else [future.result()]):
+                record(task_type, result)
 
     print("\n✅ Terminé.")
     print(f"   DOC  : {len(docs):3d} | convertis: {stats['doc_ok']}, ignorés: {stats['doc_skip']}, échecs: {stats['doc_fail']}")
     print(f"   PDF  : {len(pdfs):3d} | convertis: {stats['pdf_ok']}, ignorés: {stats['pdf_skip']}, échecs: {stats['pdf_fail']}")
     print(f"   DOCX : {len(docxs):3d} | copiés: {stats['copy_ok']}, ignorés: {stats['copy_skip']}")
-    print(f"📄 Rapport Excel : {report_path}")
+    print(f"📄 Rapport : {report_path}")
 
 
 if __name__ == "__main__":
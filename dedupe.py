@@ -35,8 +35,8 @@ DEFAULT_SOURCE = "clean_extension"
 DEFAULT_REPORT = "dedupe_report.xlsx"
 ALLOW = {".pdf", ".doc", ".docx"}
 
-# Suffixe anti-collision de clean_extension.py : _YYYYMMDD_HHMMSS
-TS_SUFFIX_RE = re.compile(r"_(\d{8}_\d{6})$")  # appliqué au stem (sans extension)
+# Suffixe anti-collision de clean_extension.py : _YYYYMMDD_HHMMSS (ou _YYYYMMDD_HHMMSS_N si déjà pris)
+TS_SUFFIX_RE = re.compile(r"_(\d{8}_\d{6})(?:_\d+)?$")  # appliqué au stem (sans extension)
 
 
 def normalized_key(p: Path) -> str:
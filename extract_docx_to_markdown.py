@@ -7,23 +7,27 @@ Conversion DOCX -> Markdown (dataset pour training LLM)
 - Utilise Mammoth pour conversion DOCX (meilleure qualité)
 - Supprime page de garde, table des matières, préambule
 - Parallélisé avec ProcessPoolExecutor
+- Rapport écrit au fil des résultats : extract_report.xlsx (défaut) ou extract_report.csv (--report-format csv)
 
 Dépendances:
-  pip install mammoth html2text
+  pip install mammoth html2text openpyxl
 """
 
 from __future__ import annotations
 
+import csv
 import re
 import os
+import sys
 import logging
+import multiprocessing
 import traceback
 import argparse
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple, Optional
+from typing import Iterable, Iterator, List, Tuple, Optional
 from concurrent.futures import ProcessPoolExecutor, as_completed
 
-import pandas as pd
 import mammoth
 import html2text
 
@@ -53,6 +57,12 @@ RITM_PATTERN = r"^(CAGIPRITM\d+)"
 # Nombre de workers (0 = auto = nombre de CPU)
 DEFAULT_WORKERS = 0
 
+# Rapport (dans le dossier courant)
+DEFAULT_REPORT_FORMAT = "xlsx"   # xlsx | csv
+REPORT_NAME = "extract_report"
+REPORT_SHEET = "Extraction Markdown"
+REPORT_COLUMNS = ["Type", "Code RITM", "Fichier source", "Chemin source", "Fichier Markdown", "Statut", "Erreur"]
+
 # Style mapping Mammoth : ignorer les styles de TOC et mapper les autres
 MAMMOTH_STYLE_MAP = """
 p[style-name='toc 1'] => !
@@ -92,15 +102,89 @@ TOC_END_MARKERS = [
     "SOMMAIRE",
 ]
 
-# Patterns pour nettoyer le contenu indésirable
+# Patterns pour nettoyer le contenu indésirable (lignes de TOC avec numéro de page)
 CLEANUP_PATTERNS = [
     (r'^[IVXLCDM]+(?:\.\d+)*\.?\s+.+?\s+\d+\s*$', '', re.MULTILINE),
     (r'^\d+(?:\.\d+)*\.?\s+.+?\s+\d+\s*$', '', re.MULTILINE),
-    (r'\[([^\]]+)\]\(#[^)]+\)', r'\1', 0),
-    (r'!\[.*?\]\(data:image[^)]+\)', '', 0),
-    (r'\n{4,}', '\n\n\n', 0),
 ]
 
+# Nettoyages sans drapeau, appliqués ensuite en une seule passe (voir cleanup_flat_sub) :
+#   link  : [texte](#ancre) -> texte
+#   image : ![...](data:image...) -> supprimée
+#   blank : 4 sauts de ligne ou plus -> 3
+CLEANUP_FLAT_PATTERN = (
+    r'(?P<link>\[(?P<link_text>[^\]]+)\]\(#[^)]+\))'
+    r'|(?P<image>!\[.*?\]\(data:image[^)]+\))'
+    r'|(?P<blank>\n{4,})'
+)
+
+# ==============================================================================
+# REGEX COMPILÉES (une fois à l'import, héritées par les workers)
+# ==============================================================================
+
+RITM_RE = re.compile(RITM_PATTERN, re.IGNORECASE)
+# Marqueurs de TOC en minuscules, sans doublon (comparés à la ligne mise en minuscules une seule fois)
+TOC_END_MARKERS_LOWER = tuple(dict.fromkeys(marker.lower() for marker in TOC_END_MARKERS))
+CLEANUP_RES = [(re.compile(pattern, flags), replacement) for pattern, replacement, flags in CLEANUP_PATTERNS]
+CLEANUP_FLAT_RE = re.compile(CLEANUP_FLAT_PATTERN)
+
+# HTML Mammoth : entrées et ancres de TOC
+TOC_LINK_RE = re.compile(r'<a\s+href="#_Toc[^"]*"[^>]*>(.*?)</a>', re.DOTALL | re.IGNORECASE)
+TOC_ANCHOR_RE = re.compile(r'<a\s+id="_Toc[^"]*"[^>]*>\s*</a>', re.IGNORECASE)
+# 1re passe de clean_html_toc (voir clean_html_toc_sub) ; chaque alternative commence
+# par une balise différente, leur ordre est donc sans effet
+HTML_TOC_RE = re.compile(
+    r'(?P<toc_paragraph><p[^>]*>\s*<a\s+href="#_Toc[^"]*"[^>]*>.*?</a>\s*</p>)'
+    r'|(?P<toc_link><a\s+href="#_Toc[^"]*"[^>]*>(?P<toc_link_text>.*?)</a>)'
+    r'|(?P<h1>(?P<h1_open><h1[^>]*>)(?P<h1_content>.*?)(?P<h1_close></h1>))',
+    re.DOTALL | re.IGNORECASE
+)
+TOC_TITLE_RES = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'Table\s+des\s+mati[eè]res',
+        r'Sommaire',
+        r'TABLE\s+DES\s+MATI[EÈ]RES',
+        r'SOMMAIRE',
+    )
+]
+EMPTY_ANCHOR_RE = re.compile(r'<a\s+id="[^"]*"[^>]*>\s*</a>')
+# Préfiltre de clean_html_toc, cherché dans le HTML replié (casefold) : un titre de TOC contient forcément
+# l'une de ces sous-chaînes. 'ı' et 'İ' (replié en 'i' + U+0307) valent 'i' pour re.IGNORECASE mais pas
+# pour casefold : leur présence impose aussi le passage des regex.
+TOC_TITLE_NEEDLES = ('sommaire', 'matières', 'matieres', 'ı', '\u0307')
+
+# Markdown : titres, numérotation, tableaux
+MD_HEADING_RE = re.compile(r'^(#{1,6})\s+(.+)$')
+MD_CHAPTER_HEADING_RE = re.compile(r'^(#{1,3})\s+(.+)$')
+BOLD_WRAPPED_RE = re.compile(r'^\*\*(.+)\*\*$')
+TRAILING_PAGE_NUMBER_RE = re.compile(r'\s+\d+\s*$')
+NUMBERED_LINE_RE = re.compile(r'^\d+\.')
+NUMBERED_SHORT_TITLE_RE = re.compile(r'^\d+\.\d*\s+[A-Z]')
+KNOWN_CHAPTER_START_RE = re.compile(
+    r'^(?:Description\s+du\s+projet'
+    r'|Introduction'
+    r'|Contexte\s+(?:du|et)'
+    r'|Pr[ée]sentation'
+    r'|Objectifs?\s+(?:du|et))',
+    re.IGNORECASE
+)
+ROMAN_NUMBERING_RE = re.compile(r'^[IVXLCDM]+\.?\s+[IVXLCDM]*\.?\s*\d*\.?\s*[A-ZÀ-Ý]')
+ARABIC_NUMBERING_RE = re.compile(r'^\d+\.?\s+[A-ZÀ-Ý]')
+PRELIMINARY_RE = re.compile(r'^I\.\d+\.?\s+')
+MULTI_BLANK_LINES_RE = re.compile(r'\n{3,}')
+TRAILING_SPACES_RE = re.compile(r' +$', re.MULTILINE)
+
+# Classes de caractères testées par str.strip (boucle C, sans moteur regex) :
+# "not line.strip(TABLE_SEPARATOR_CHARS)" équivaut à re.match(r'^[-|\s:]+$', line) pour une ligne non vide.
+# WHITESPACE_CHARS = les caractères reconnus par \s (str.isspace).
+WHITESPACE_CHARS = (
+    '\t\n\x0b\x0c\r\x1c\x1d\x1e\x1f \x85\xa0\u1680'
+    '\u2000\u2001\u2002\u2003\u2004\u2005\u2006\u2007\u2008\u2009\u200a'
+    '\u2028\u2029\u202f\u205f\u3000'
+)
+TABLE_SEPARATOR_CHARS = '-|:' + WHITESPACE_CHARS
+RULE_LINE_CHARS = '-_=|' + WHITESPACE_CHARS
+
 
 # ==============================================================================
 # EXTRACTION CODE RITM
@@ -108,7 +192,7 @@ CLEANUP_PATTERNS = [
 
 def extract_ritm(filename: str) -> Optional[str]:
     """Extrait le code RITM du nom de fichier."""
-    match = re.match(RITM_PATTERN, filename, re.IGNORECASE)
+    match = RITM_RE.match(filename)
     if match:
         return match.group(1).upper()
     return None
@@ -139,40 +223,41 @@ def scan_docx_files(directory: Path) -> List[Tuple[Path, str]]:
 
 def clean_html_toc(html: str) -> str:
     """Supprime les éléments de TOC du HTML."""
-    html = re.sub(
-        r'<p[^>]*>\s*<a\s+href="#_Toc[^"]*"[^>]*>.*?</a>\s*</p>',
-        '',
-        html,
-        flags=re.DOTALL | re.IGNORECASE
-    )
-
-    html = re.sub(
-        r'<a\s+href="#_Toc[^"]*"[^>]*>(.*?)</a>',
-        r'\1',
-        html,
-        flags=re.DOTALL | re.IGNORECASE
-    )
+    # Sans ancre/lien _Toc ni titre de TOC, les regex ne trouveraient rien : recherche de sous-chaînes
+    # (boucle C) au lieu de deux parcours regex insensibles à la casse
+    folded = html.casefold()
+    has_toc_anchor = '_toc' in folded
+    if has_toc_anchor or any(needle in folded for needle in TOC_TITLE_NEEDLES):
+        html = HTML_TOC_RE.sub(clean_html_toc_sub, html)
+    # Ancres _Toc retirées après coup : Mammoth imbrique les signets dans les liens de TOC
+    # (<a href="#_Toc.."><a id="_Toc.."></a>..</a>), l'ancre n'existe qu'une fois le lien déroulé
+    if has_toc_anchor:
+        html = TOC_ANCHOR_RE.sub('', html)
+    return html
 
-    def fix_toc_h1(match):
-        content = match.group(1)
-        toc_patterns = [
-            r'Table\s+des\s+mati[eè]res',
-            r'Sommaire',
-            r'TABLE\s+DES\s+MATI[EÈ]RES',
-            r'SOMMAIRE'
-        ]
-        for pattern in toc_patterns:
-            if re.search(pattern, content, re.IGNORECASE):
-                parts = re.split(r'<a\s+id="[^"]*"[^>]*>\s*</a>', content)
-                if len(parts) > 1 and parts[-1].strip():
-                    return f'<h1>{parts[-1].strip()}</h1>'
-                return ''
-        return match.group(0)
-
-    html = re.sub(r'<h1[^>]*>(.*?)</h1>', fix_toc_h1, html, flags=re.DOTALL | re.IGNORECASE)
-    html = re.sub(r'<a\s+id="_Toc[^"]*"[^>]*>\s*</a>', '', html, flags=re.IGNORECASE)
 
-    return html
+def clean_html_toc_sub(match: re.Match) -> str:
+    """
+    Remplacement de HTML_TOC_RE selon l'élément reconnu :
+      - paragraphe d'entrée de TOC : supprimé
+      - lien vers une ancre _Toc : remplacé par son texte
+      - <h1> "Table des matières"/"Sommaire" : supprimé, ou réduit au titre qui le suit après une ancre ;
+        liens _Toc déroulés dans les autres
+    """
+    kind = match.lastgroup
+    if kind == 'toc_paragraph':
+        return ''
+    if kind == 'toc_link':
+        return match.group('toc_link_text')
+
+    content = TOC_LINK_RE.sub(r'\1', match.group('h1_content'))
+    for toc_re in TOC_TITLE_RES:
+        if toc_re.search(content):
+            parts = EMPTY_ANCHOR_RE.split(content)
+            if len(parts) > 1 and parts[-1].strip():
+                return f'<h1>{parts[-1].strip()}</h1>'
+            return ''
+    return match.group('h1_open') + content + match.group('h1_close')
 
 
 def docx_to_markdown(docx_path: Path) -> str:
@@ -183,9 +268,9 @@ def docx_to_markdown(docx_path: Path) -> str:
             style_map=MAMMOTH_STYLE_MAP,
             include_embedded_style_map=False,
         )
-        html_content = result.value
-
-    html_content = clean_html_toc(html_content)
+    # Seul le HTML nettoyé reste en mémoire (le résultat Mammoth est libéré)
+    html_content = clean_html_toc(result.value)
+    del result
 
     h2t = html2text.HTML2Text()
     h2t.ignore_links = False
@@ -196,6 +281,7 @@ def docx_to_markdown(docx_path: Path) -> str:
     h2t.skip_internal_links = True
 
     markdown = h2t.handle(html_content)
+    del html_content
     markdown = post_process_markdown(markdown)
 
     return markdown
@@ -207,44 +293,51 @@ def post_process_markdown(content: str) -> str:
 
     start_index = find_content_start(lines)
     if start_index > 0:
-        lines = lines[start_index:]
+        content = '\n'.join(lines[start_index:])
 
-    content = '\n'.join(lines)
+    for cleanup_re, replacement in CLEANUP_RES:
+        content = cleanup_re.sub(replacement, content)
+    # Chaque alternative contient un littéral : passe regex sautée si aucun n'est présent
+    if '](#' in content or 'data:image' in content or '\n\n\n\n' in content:
+        content = CLEANUP_FLAT_RE.sub(cleanup_flat_sub, content)
 
-    for pattern, replacement, flags in CLEANUP_PATTERNS:
-        if flags:
-            content = re.sub(pattern, replacement, content, flags=flags)
-        else:
-            content = re.sub(pattern, replacement, content)
+    # Passes ligne à ligne chaînées (générateurs) : un seul split et un seul join
+    lines = clean_tables(content.split('\n'))
+    lines = normalize_headings(lines)
+    return final_cleanup(lines)
 
-    content = clean_tables(content)
-    content = normalize_headings(content)
-    content = final_cleanup(content)
 
-    return content
+def cleanup_flat_sub(match: re.Match) -> str:
+    """Remplacement de CLEANUP_FLAT_RE selon l'alternative reconnue."""
+    kind = match.lastgroup
+    if kind == 'link':
+        return match.group('link_text')
+    if kind == 'blank':
+        return '\n\n\n'
+    return ''
 
 
 def find_content_start(lines: List[str]) -> int:
     """Trouve l'index de la première ligne du vrai contenu."""
+    # Lignes nettoyées une seule fois : has_content_after relit des fenêtres de 20 lignes qui se chevauchent
+    stripped = [line.strip() for line in lines]
 
     def has_content_after(start_idx: int) -> bool:
-        current_line = lines[start_idx].strip()
+        current_line = stripped[start_idx]
         current_level = current_line.count('#') if current_line.startswith('#') else 0
         content_lines = 0
 
-        for j in range(start_idx + 1, min(start_idx + 20, len(lines))):
-            line = lines[j].strip()
+        for line in stripped[start_idx + 1:start_idx + 20]:
             if not line:
                 continue
 
             if line.startswith('#'):
-                line_level = line.count('#') if line.startswith('#') else 0
-                if line_level > 0 and line_level <= current_level:
+                if line.count('#') <= current_level:
                     if content_lines == 0:
                         return False
                 continue
 
-            if re.match(r'^\d+\.\d*\s+[A-Z]', line) and len(line) < 50:
+            if NUMBERED_SHORT_TITLE_RE.match(line) and len(line) < 50:
                 continue
 
             if len(line) > 40:
@@ -257,17 +350,17 @@ def find_content_start(lines: List[str]) -> int:
     toc_found = False
     toc_end_index = 0
 
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
-        for marker in TOC_END_MARKERS:
-            if marker.lower() in line_stripped.lower():
-                toc_found = True
-                toc_end_index = i
-                break
+    # Dernière ligne contenant un marqueur de TOC : parcours depuis la fin, arrêt au premier trouvé
+    for i in range(len(stripped) - 1, -1, -1):
+        line_lower = stripped[i].lower()
+        if any(marker in line_lower for marker in TOC_END_MARKERS_LOWER):
+            toc_found = True
+            toc_end_index = i
+            break
 
     if toc_found:
         for i in range(toc_end_index + 1, len(lines)):
-            line = lines[i].strip()
+            line = stripped[i]
             if not line:
                 continue
             if is_chapter_heading(line) and has_content_after(i):
@@ -276,12 +369,11 @@ def find_content_start(lines: List[str]) -> int:
     consecutive_titles = 0
     last_title_idx = -1
 
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
+    for i, line_stripped in enumerate(stripped):
         if not line_stripped:
             continue
 
-        is_title = line_stripped.startswith('#') or re.match(r'^\d+\.', line_stripped)
+        is_title = line_stripped.startswith('#') or NUMBERED_LINE_RE.match(line_stripped)
 
         if is_title:
             consecutive_titles += 1
@@ -289,12 +381,11 @@ def find_content_start(lines: List[str]) -> int:
         else:
             if consecutive_titles >= 5:
                 for j in range(last_title_idx, len(lines)):
-                    if lines[j].strip().startswith('#') and has_content_after(j):
+                    if stripped[j].startswith('#') and has_content_after(j):
                         return j
             consecutive_titles = 0
 
-    for i, line in enumerate(lines):
-        line_stripped = line.strip()
+    for i, line_stripped in enumerate(stripped):
         if is_chapter_heading(line_stripped) and has_content_after(i):
             return i
 
@@ -303,163 +394,193 @@ def find_content_start(lines: List[str]) -> int:
 
 def is_chapter_heading(line: str) -> bool:
     """Vérifie si une ligne est un titre de chapitre principal."""
-    match = re.match(r'^(#{1,3})\s+(.+)$', line)
+    # Préfiltre : la plupart des lignes ne sont pas des titres Markdown (ni regex, ni entrée de cache)
+    if not line.startswith('#'):
+        return False
+    return is_chapter_title(line)
+
+
+@lru_cache(maxsize=8192)
+def is_chapter_title(line: str) -> bool:
+    """
+    Partie regex de is_chapter_heading (ligne commençant par '#').
+    Mise en cache : find_content_start teste les mêmes lignes dans plusieurs parcours.
+    """
+    match = MD_CHAPTER_HEADING_RE.match(line)
     if not match:
         return False
 
     title_text = match.group(2).strip()
 
-    if re.search(r'\s+\d+\s*$', title_text):
+    if TRAILING_PAGE_NUMBER_RE.search(title_text):
         return False
 
-    title_text = re.sub(r'^\*\*(.+)\*\*$', r'\1', title_text)
+    title_text = BOLD_WRAPPED_RE.sub(r'\1', title_text)
 
     if not title_text or len(title_text) < 5:
         return False
 
-    known_chapter_starts = [
-        r'^Description\s+du\s+projet',
-        r'^Introduction',
-        r'^Contexte\s+(?:du|et)',
-        r'^Pr[ée]sentation',
-        r'^Objectifs?\s+(?:du|et)',
-    ]
-
-    for pattern in known_chapter_starts:
-        if re.search(pattern, title_text, re.IGNORECASE):
-            return True
-
-    has_numbering = re.match(
-        r'^[IVXLCDM]+\.?\s+[IVXLCDM]*\.?\s*\d*\.?\s*[A-ZÀ-Ý]',
-        title_text
-    ) or re.match(
-        r'^\d+\.?\s+[A-ZÀ-Ý]',
-        title_text
-    )
+    if KNOWN_CHAPTER_START_RE.match(title_text):
+        return True
+
+    has_numbering = ROMAN_NUMBERING_RE.match(title_text) or ARABIC_NUMBERING_RE.match(title_text)
 
-    is_preliminary = re.match(r'^I\.\d+\.?\s+', title_text)
+    is_preliminary = PRELIMINARY_RE.match(title_text)
 
     return has_numbering and not is_preliminary
 
 
-def clean_tables(content: str) -> str:
-    """Nettoie et normalise les tableaux Markdown."""
-    lines = content.split('\n')
-    result = []
-    in_table = False
-    table_lines = []
+def clean_tables(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Nettoie et normalise les tableaux Markdown (lignes en entrée, lignes en sortie).
+    Chaque ligne de tableau est découpée en cellules dès sa lecture (séparateurs ignorés) ;
+    le tableau est émis à sa fin, une fois le nombre de colonnes connu (voir format_table).
+    """
+    rows = None     # cellules du tableau en cours (None : hors tableau)
 
     for line in lines:
         stripped = line.strip()
-
-        is_table_line = False
-        if '|' in stripped:
-            if not stripped.startswith('#'):
-                if re.match(r'^[-|\s:]+$', stripped) or '|' in stripped:
-                    is_table_line = True
-
-        if is_table_line:
-            if not in_table:
-                in_table = True
-                table_lines = []
-            table_lines.append(line)
-        else:
-            if in_table:
-                processed_table = process_table(table_lines)
-                result.extend(processed_table)
-                result.append('')
-                in_table = False
-                table_lines = []
-            result.append(line)
-
-    if in_table and table_lines:
-        processed_table = process_table(table_lines)
-        result.extend(processed_table)
-
-    return '\n'.join(result)
-
-
-def process_table(table_lines: List[str]) -> List[str]:
-    """Traite un tableau pour le normaliser au format Markdown standard."""
-    if not table_lines:
-        return []
-
-    rows = []
-
-    for line in table_lines:
-        line = line.strip()
-        if not line:
+        if '|' in stripped and not stripped.startswith('#'):
+            if rows is None:
+                rows = []
+            if '-' in stripped and not stripped.strip(TABLE_SEPARATOR_CHARS):
+                continue
+            if stripped.startswith('|'):
+                stripped = stripped[1:]
+            if stripped.endswith('|'):
+                stripped = stripped[:-1]
+            rows.append([c.strip() for c in stripped.split('|')])
             continue
 
-        if re.match(r'^[-|\s:]+$', line) and '-' in line:
-            continue
+        if rows is not None:
+            yield from format_table(rows)
+            yield ''
+            rows = None
+        yield line
 
-        if line.startswith('|'):
-            line = line[1:]
-        if line.endswith('|'):
-            line = line[:-1]
+    if rows is not None:
+        yield from format_table(rows)
 
-        cells = [c.strip() for c in line.split('|')]
-        if cells:
-            rows.append(cells)
 
+def format_table(rows: List[List[str]]) -> Iterator[str]:
+    """Émet un tableau au format Markdown standard : en-tête, séparateur, lignes complétées à max_cols."""
     if not rows:
-        return []
-
-    max_cols = max(len(row) for row in rows)
-    if max_cols == 0:
-        return []
-
-    for row in rows:
-        while len(row) < max_cols:
-            row.append('')
-
-    result = []
-    header = '| ' + ' | '.join(rows[0]) + ' |'
-    result.append(header)
-    separator = '| ' + ' | '.join(['---'] * max_cols) + ' |'
-    result.append(separator)
+        return
 
+    max_cols = max(map(len, rows))
+    header = rows[0]
+    yield '| ' + ' | '.join(header + [''] * (max_cols - len(header))) + ' |'
+    yield '| ' + ' | '.join(['---'] * max_cols) + ' |'
     for row in rows[1:]:
-        line = '| ' + ' | '.join(row) + ' |'
-        result.append(line)
-
-    return result
-
+        yield '| ' + ' | '.join(row + [''] * (max_cols - len(row))) + ' |'
 
-def normalize_headings(content: str) -> str:
-    """Normalise les titres."""
-    lines = content.split('\n')
-    result = []
 
+def normalize_headings(lines: Iterable[str]) -> Iterator[str]:
+    """Normalise les titres (lignes en entrée, lignes en sortie)."""
     for line in lines:
-        match = re.match(r'^(#{1,6})\s+(.+)$', line)
+        match = MD_HEADING_RE.match(line) if line.startswith('#') else None
         if match:
             level = len(match.group(1))
             title_text = match.group(2).strip()
-            title_text = re.sub(r'^\*\*(.+)\*\*$', r'\1', title_text)
+            title_text = BOLD_WRAPPED_RE.sub(r'\1', title_text)
             line = '#' * level + ' ' + title_text
 
-        result.append(line)
-
-    return '\n'.join(result)
+        yield line
 
 
-def final_cleanup(content: str) -> str:
-    """Nettoyage final du contenu."""
-    content = re.sub(r'\n{3,}', '\n\n', content)
-    content = re.sub(r' +$', '', content, flags=re.MULTILINE)
-    content = content.lstrip('\n')
-    content = content.rstrip() + '\n'
+def final_cleanup(lines: Iterable[str]) -> str:
+    """
+    Nettoyage final du contenu, en une passe sur les lignes :
+      - une suite de lignes vides est réduite à une seule
+      - espaces de fin de ligne retirés
+      - lignes blanches supprimées en début et en fin, contenu terminé par un seul saut de ligne
+      - lignes de séparation (-, _, =, blancs) hors tableau supprimées
+    """
+    result = []
+    keep = 0                # longueur de result jusqu'à la dernière ligne non blanche
+    strip_last = False      # dernière ligne non blanche conservée : à nettoyer (rstrip)
+    started = False         # première ligne non vide rencontrée
+    has_text = False
+    previous_empty = False
 
-    lines = content.split('\n')
-    cleaned_lines = []
     for line in lines:
-        if re.match(r'^[-_=\s|]+$', line) and '|' not in line:
+        if not line:
+            # Suite de lignes vides (avant retrait des espaces) : une seule conservée
+            if previous_empty:
+                continue
+            previous_empty = True
+            if started:
+                result.append('')
             continue
-        cleaned_lines.append(line)
+        previous_empty = False
 
-    return '\n'.join(cleaned_lines)
+        line = line.rstrip(' ')
+        if not line:
+            if started:
+                result.append('')
+            continue
+        started = True
+
+        if not line.strip(WHITESPACE_CHARS):
+            continue
+        has_text = True
+        if '|' not in line and not line.strip(RULE_LINE_CHARS):
+            keep, strip_last = len(result), False
+            continue
+        result.append(line)
+        keep, strip_last = len(result), True
+
+    if not has_text:
+        return '\n'
+    del result[keep:]
+    if strip_last:
+        result[-1] = result[-1].rstrip()
+    result.append('')
+    return '\n'.join(result)
+
+
+# ==============================================================================
+# RAPPORT
+# ==============================================================================
+
+class ReportWriter:
+    """
+    Rapport écrit ligne à ligne pendant le traitement (mémoire constante, rapport partiel si interruption) :
+      - csv : UTF-8 avec BOM (ouverture directe dans Excel), lisible pendant le traitement
+      - xlsx : openpyxl write-only (lignes sérialisées au fil de l'eau), enregistré à la fermeture
+    """
+    def __init__(self, report_path: Path, report_format: str):
+        self.report_path = report_path
+        self.report_format = report_format
+        if report_format == "xlsx":
+            from openpyxl import Workbook
+            self._wb = Workbook(write_only=True)
+            self._ws = self._wb.create_sheet(REPORT_SHEET)
+            self._ws.append(REPORT_COLUMNS)
+        else:
+            self._file = open(report_path, "w", newline="", encoding="utf-8-sig")
+            self._csv = csv.writer(self._file)
+            self._csv.writerow(REPORT_COLUMNS)
+
+    def write(self, row: Tuple[str, ...]):
+        if self.report_format == "xlsx":
+            self._ws.append(row)
+        else:
+            self._csv.writerow(row)
+            self._file.flush()
+
+    def close(self):
+        if self.report_format == "xlsx":
+            self._wb.save(self.report_path)
+        else:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+        return False
 
 
 # ==============================================================================
@@ -511,6 +632,8 @@ def main() -> int:
                         help=f"Dossier de sortie (défaut: {DEFAULT_OUTPUT_DIR})")
     parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
                         help="Nombre de workers (défaut: 0 = auto)")
+    parser.add_argument("--report-format", choices=["xlsx", "csv"], default=DEFAULT_REPORT_FORMAT,
+                        help=f"Format du rapport {REPORT_NAME} (défaut: {DEFAULT_REPORT_FORMAT})")
     args = parser.parse_args()
 
     edb_dir = Path(args.edb_dir).resolve()
@@ -545,20 +668,26 @@ def main() -> int:
         tasks.append((str(path), ritm, "ndc", str(out_ndc), str(log_dir)))
 
     total = len(tasks)
-    workers = args.workers if args.workers > 0 else os.cpu_count()
+    workers = args.workers if args.workers > 0 else (os.cpu_count() or 1)
+    workers = max(1, min(workers, total))
     logger.info(f"Traitement de {total} fichiers avec {workers} workers...")
 
     stats = {"ok": 0, "error": 0}
-    results = []
+
+    # Linux : fork (mammoth, html2text et les regex compilées sont hérités, pas ré-importés par worker)
+    mp_context = multiprocessing.get_context("fork") if sys.platform.startswith("linux") else None
+
+    # Rapport dans le dossier courant, une ligne écrite par fichier terminé
+    report_path = Path.cwd() / f"{REPORT_NAME}.{args.report_format}"
 
     # Traitement parallèle
-    with ProcessPoolExecutor(max_workers=workers) as executor:
+    with ReportWriter(report_path, args.report_format) as report, \
+            ProcessPoolExecutor(max_workers=workers, mp_context=mp_context) as executor:
         futures = {executor.submit(process_single_file, task): task for task in tasks}
 
         for i, future in enumerate(as_completed(futures), 1):
-            result = future.result()
-            mode, ritm, filename, src, out_path, status, error = result
-            results.append(result)
+            mode, ritm, filename, src, out_path, status, error = future.result()
+            report.write((mode.upper(), ritm, filename, src, out_path, status, error))
 
             if status == "OK":
                 stats["ok"] += 1
@@ -567,24 +696,6 @@ def main() -> int:
                 stats["error"] += 1
                 logger.error(f"[{i}/{total}] ERROR ({mode}) {ritm} - {filename}: {error}")
 
-    # Générer le rapport Excel
-    report_rows = []
-    for mode, ritm, filename, src, out_path, status, error in results:
-        report_rows.append({
-            "Type": mode.upper(),
-            "Code RITM": ritm,
-            "Fichier source": filename,
-            "Chemin source": src,
-            "Fichier Markdown": out_path,
-            "Statut": status,
-            "Erreur": error,
-        })
-
-    report_path = Path.cwd() / "extract_report.xlsx"
-    df = pd.DataFrame(report_rows)
-    with pd.ExcelWriter(report_path, engine="openpyxl") as writer:
-        df.to_excel(writer, index=False, sheet_name="Extraction Markdown")
-
     # Afficher les codes RITM trouvés
     edb_ritms = set(ritm for _, ritm in edb_files)
     ndc_ritms = set(ritm for _, ritm in ndc_files)